@@ -7,7 +7,8 @@ import requests
 import json
 import sys
 import re
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Import prompt_toolkit for modern multi-line input with bracketed paste
 try:
@@ -22,6 +23,35 @@ except ImportError:
 BASE_URL = "http://localhost:8001"
 API_URL = f"{BASE_URL}/ask"
 
+# One keep-alive session so the health check, questions and stress-test scenarios
+# reuse the same connection instead of opening a new one per request
+_SESSION = requests.Session()
+
+# requests.Session is not thread-safe, so each stress-test worker keeps its own
+# (created by _open_worker_session, closed by run_stress_test)
+_WORKER_SESSIONS = threading.local()
+
+# Parser patterns, compiled once (Ignore case + Dot matches newlines handles multi-line input)
+_PARSE_FLAGS = re.IGNORECASE | re.DOTALL
+# Whole words only, so e.g. "nowhere" or "realistic" are not read as verification language
+_VERIFICATION_RE = re.compile(
+    r'\b(?:updated|verified|confirmed|actual|current|now|latest|real|live|sensors?)\b', re.IGNORECASE
+)
+# Metric keywords in order; the value is the first number after the last one
+_FLOOD_KW = (re.compile(r'flood', re.IGNORECASE), re.compile(r'risk', re.IGNORECASE))
+_HOSP_KW = (re.compile(r'hospital|icu|capacity', re.IGNORECASE),)
+_CONF_KW = (re.compile(r'confidence', re.IGNORECASE),)
+_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+# The "<word> outbreak/symptoms/cases" branch only starts at a word boundary: a start inside a
+# word can never be the leftmost match, and retrying from every character is quadratic in word length
+_DISEASE_RE = re.compile(r'(?:predicted\s*)?disease[:\s]+(\w+)|(?<!\w)(\w+)\s*(?:outbreak|symptoms|cases)|symptoms?\s+of\s+(\w+)', _PARSE_FLAGS)
+_COMMON_DISEASES = frozenset({'Cholera', 'Dengue', 'Malaria', 'Typhoid', 'Dysentery', 'Diarrhea'})
+_PREVSTATE_RE = re.compile(r'(?:previous|prior|existing|current)\s+(?:evacuation|advisory|order)', _PARSE_FLAGS)
+
+# Stress-test response patterns
+_DECISION_RE = re.compile(r'SYSTEM DECISION:\s*([^\n]+)', re.IGNORECASE)
+_RISK_RE = re.compile(r'Risk Score:\s*([\d.]+)', re.IGNORECASE)
+
 def print_header():
     """Print a formatted header"""
     print("=" * 80)
@@ -32,7 +62,7 @@ def print_header():
 def check_server():
     """Check if the server is running"""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
+        response = _SESSION.get(f"{BASE_URL}/health", timeout=2)
         if response.status_code == 200:
             print("[OK] Backend server is running and healthy")
             return True
@@ -154,6 +184,21 @@ def get_user_question():
     
     return question
 
+def _find_number_after(text, keyword_patterns):
+    """
+    Match the first number that follows each keyword in turn (e.g. "flood" ... "risk" ... 0.33).
+
+    Equivalent to a lazy 'flood.*?risk.*?(number)' DOTALL search, but every stage resumes
+    where the previous one stopped, so the text is scanned once without backtracking.
+    """
+    pos = 0
+    for pattern in keyword_patterns:
+        keyword_match = pattern.search(text, pos)
+        if keyword_match is None:
+            return None
+        pos = keyword_match.end()
+    return _NUMBER_RE.search(text, pos)
+
 def smart_parse_input(user_text, default_payload):
     """
     Parses natural language text to extract specific risk metrics.
@@ -167,10 +212,8 @@ def smart_parse_input(user_text, default_payload):
         dict: Updated payload with parsed values (if found)
     """
     updated_payload = default_payload.copy()
-    print("\n[PARSER] Scanning input for custom values...")
-
-    # Flags: Ignore case + Dot matches newlines (handles multi-line input)
-    flags = re.IGNORECASE | re.DOTALL
+    # Collect parser log lines and write them in one call at the end
+    log_lines = ["\n[PARSER] Scanning input for custom values..."]
 
     # A) FLOOD RISK PRIORITY RULE
     # If user text contains numeric flood risk + verification language
@@ -178,18 +221,12 @@ def smart_parse_input(user_text, default_payload):
     # Default flood risk must be discarded.
     
     # Check for verification language patterns
-    verification_keywords = [
-        r'updated', r'verified', r'confirmed', r'actual', r'current', 
-        r'now', r'latest', r'real', r'live', r'sensor', r'sensors'
-    ]
-    has_verification_language = any(
-        re.search(pattern, user_text, flags) for pattern in verification_keywords
-    )
+    has_verification_language = _VERIFICATION_RE.search(user_text) is not None
     
     # 1. Flood Risk 
     # Matches: "flood risk... 0.33" or "flood risk... (0.33)" or "flood risk is now low (0.33)"
     # Pattern handles parentheses, newlines, and extra words
-    flood_match = re.search(r'flood.*?risk.*?(\d+(?:\.\d+)?)', user_text, flags)
+    flood_match = _find_number_after(user_text, _FLOOD_KW)
     if flood_match:
         val = float(flood_match.group(1))
         # Handle percentages (e.g. 33 vs 0.33)
@@ -201,19 +238,19 @@ def smart_parse_input(user_text, default_payload):
         # PART 1: STRICT DEFAULT OVERRIDE - Log explicit override
         old_default = default_payload.get("flood_risk", "N/A")
         updated_payload["flood_risk"] = val
-        print(f"   >>> OVERRIDE: Replaced default {old_default} with verified {val:.2f}")
+        log_lines.append(f"   >>> OVERRIDE: Replaced default {old_default} with verified {val:.2f}")
         
         # A) FLOOD RISK PRIORITY RULE: Set source if verification language detected
         if has_verification_language:
             updated_payload["flood_risk_source"] = "USER_VERIFIED"
-            print(f"   [+] MATCH: flood_risk -> {val:.2f} (Source: USER_VERIFIED)")
+            log_lines.append(f"   [+] MATCH: flood_risk -> {val:.2f} (Source: USER_VERIFIED)")
         else:
             updated_payload["flood_risk_source"] = "USER_INPUT"
-            print(f"   [+] MATCH: flood_risk -> {val:.2f} (Source: USER_INPUT)")
+            log_lines.append(f"   [+] MATCH: flood_risk -> {val:.2f} (Source: USER_INPUT)")
 
     # 2. Hospital Capacity
     # Matches: "hospital capacity... 75%" or "ICU... 0.75" or "capacity is (0.75)"
-    hosp_match = re.search(r'(?:hospital|icu|capacity).*?(\d+(?:\.\d+)?)', user_text, flags)
+    hosp_match = _find_number_after(user_text, _HOSP_KW)
     if hosp_match:
         val = float(hosp_match.group(1))
         # Handle percentages (e.g. 75 vs 0.75)
@@ -225,12 +262,12 @@ def smart_parse_input(user_text, default_payload):
         # PART 1: STRICT DEFAULT OVERRIDE - Log explicit override
         old_default = default_payload.get("hospital_capacity", "N/A")
         updated_payload["hospital_capacity"] = val
-        print(f"   >>> OVERRIDE: Replaced default {old_default} with verified {val:.2f}")
-        print(f"   [+] MATCH: hospital_capacity -> {val:.2f}")
+        log_lines.append(f"   >>> OVERRIDE: Replaced default {old_default} with verified {val:.2f}")
+        log_lines.append(f"   [+] MATCH: hospital_capacity -> {val:.2f}")
 
     # 3. Confidence
     # Matches: "confidence... 0.92" or "confidence is (0.92)" or "92% confidence"
-    conf_match = re.search(r'confidence.*?(\d+(?:\.\d+)?)', user_text, flags)
+    conf_match = _find_number_after(user_text, _CONF_KW)
     if conf_match:
         val = float(conf_match.group(1))
         # Handle percentages (e.g. 92 vs 0.92)
@@ -242,24 +279,23 @@ def smart_parse_input(user_text, default_payload):
         # PART 1: STRICT DEFAULT OVERRIDE - Log explicit override
         old_default = default_payload.get("confidence", "N/A")
         updated_payload["confidence"] = val
-        print(f"   >>> OVERRIDE: Replaced default {old_default} with verified {val:.2f}")
-        print(f"   [+] MATCH: confidence -> {val:.2f}")
+        log_lines.append(f"   >>> OVERRIDE: Replaced default {old_default} with verified {val:.2f}")
+        log_lines.append(f"   [+] MATCH: confidence -> {val:.2f}")
 
     # 4. Disease/Predicted Disease (optional - extract disease name if mentioned)
-    disease_match = re.search(r'(?:predicted\s*)?disease[:\s]+(\w+)|(\w+)\s*(?:outbreak|symptoms|cases)|symptoms?\s+of\s+(\w+)', user_text, flags)
+    disease_match = _DISEASE_RE.search(user_text)
     if disease_match:
         disease_name = (disease_match.group(1) or disease_match.group(2) or disease_match.group(3)).capitalize()
         # Common disease names to validate
-        common_diseases = ['Cholera', 'Dengue', 'Malaria', 'Typhoid', 'Dysentery', 'Diarrhea']
-        if disease_name in common_diseases or len(disease_name) > 3:
+        if disease_name in _COMMON_DISEASES or len(disease_name) > 3:
             updated_payload["predicted_disease"] = disease_name
-            print(f"   [+] MATCH: predicted_disease -> {disease_name}")
+            log_lines.append(f"   [+] MATCH: predicted_disease -> {disease_name}")
 
     # 5. Previous State (for de-escalation logic)
-    previous_state_match = re.search(r'(?:previous|prior|existing|current)\s+(?:evacuation|advisory|order)', user_text, flags)
+    previous_state_match = _PREVSTATE_RE.search(user_text)
     if previous_state_match:
         updated_payload["previous_state"] = "EVACUATION_ORDER"
-        print(f"   [+] MATCH: previous_state -> EVACUATION_ORDER")
+        log_lines.append(f"   [+] MATCH: previous_state -> EVACUATION_ORDER")
     
     # 🔧 TRUST FIX: Inject verification metadata when ANY number override is found
     # This ensures the backend trusts the parsed values and enables revocation logic
@@ -273,10 +309,11 @@ def smart_parse_input(user_text, default_payload):
         # Always set previous_state to enable revocation logic when valid numbers are found
         if "previous_state" not in updated_payload:
             updated_payload["previous_state"] = "EVACUATION_ORDER"
-            print(f"   [+] METADATA INJECTED: is_verified=True, source=official_sensor_network, previous_state=EVACUATION_ORDER")
+            log_lines.append(f"   [+] METADATA INJECTED: is_verified=True, source=official_sensor_network, previous_state=EVACUATION_ORDER")
         else:
-            print(f"   [+] METADATA INJECTED: is_verified=True, source=official_sensor_network, previous_state={updated_payload['previous_state']}")
+            log_lines.append(f"   [+] METADATA INJECTED: is_verified=True, source=official_sensor_network, previous_state={updated_payload['previous_state']}")
 
+    sys.stdout.write("\n".join(log_lines) + "\n")
     return updated_payload
 
 def test_cheseal_interactive():
@@ -337,7 +374,7 @@ def test_cheseal_interactive():
     
     try:
         # Send POST request (use final_payload which is the actual payload after parsing)
-        response = requests.post(
+        response = _SESSION.post(
             API_URL,
             json=final_payload,
             headers={"Content-Type": "application/json"},
@@ -412,7 +449,8 @@ What is the correct system decision and re-escalation threshold?""",
             "previous_state": "EVACUATION_ORDER",
             "is_verified": True
         },
-        "expected_result": "DOWNGRADE"
+        "expected_result": "DOWNGRADE",
+        "pass_keywords": ("DOWNGRADE", "REVOKE")
     },
     {
         "name": "SCENARIO 2: MEDICAL ISOLATED (Osteoarthritis)",
@@ -421,7 +459,8 @@ What is the correct system decision and re-escalation threshold?""",
             "flood_risk": 0.0,   # No environmental risk
             "is_verified": True
         },
-        "expected_result": "HOLD"
+        "expected_result": "HOLD",
+        "pass_keywords": ("HOLD", "MEDICAL", "NORMAL")
     },
     {
         "name": "SCENARIO 3: HYBRID ESCALATION (Cyclone + Disease)",
@@ -431,49 +470,72 @@ What is the correct system decision and re-escalation threshold?""",
             "disease": "Diarrheal",
             "is_verified": True
         },
-        "expected_result": "EVACUATE"
+        "expected_result": "EVACUATE",
+        "pass_keywords": ("EVACUATE", "INITIATE")
     }
 ]
 
+def _stress_test_payload(test):
+    """Build the /ask payload for one stress test scenario."""
+    # FIX: Match QueryRequest schema from main.py
+    # question (required), city, flood_risk, disease, confidence at top level
+    # is_verified, previous_state, and hospital_capacity go in dashboard_state
+    flood_risk_val = test['context'].get('flood_risk', 0.5)
+    payload = {
+        "question": test['question'],  # FIX: Use "question" not "query"
+        "city": "Miami",
+        # Risk metrics at top level (only fields in QueryRequest model)
+        "flood_risk": flood_risk_val,
+        "confidence": 0.95,
+        "disease": test['context'].get('disease', None),
+        "predicted_disease": test['context'].get('disease', None),  # Also set predicted_disease
+        # All other data in dashboard_state (as expected by main.py)
+        "dashboard_state": {
+            "previous_state": test['context'].get('previous_state', None),
+            "is_verified": test['context'].get('is_verified', True),
+            "flood_risk": flood_risk_val,  # Ensure it's in dashboard_state too
+            "hospital_capacity": 0.5
+        }
+    }
+    return flood_risk_val, payload
+
+def _open_worker_session(sessions):
+    """ThreadPoolExecutor initializer: give this worker its own Session."""
+    _WORKER_SESSIONS.session = requests.Session()
+    sessions.append(_WORKER_SESSIONS.session)
+
+def _post_stress_test(payload):
+    """Send one stress test scenario and return the decoded response."""
+    response = _WORKER_SESSIONS.session.post(API_URL, json=payload, timeout=45)
+    response.raise_for_status()
+    return response.json()
+
 def run_stress_test():
     """Runs the 3 defined stress test scenarios automatically."""
     print("\n" + "="*80)
     print("[STRESS TEST] STARTING AUTOMATED STRESS TEST (3 SCENARIOS)")
     print("="*80 + "\n")
 
-    for i, test in enumerate(STRESS_TESTS):
+    # Scenarios are independent: send them all at once, then report in order
+    payloads = [_stress_test_payload(test) for test in STRESS_TESTS]
+    sessions = []
+    try:
+        with ThreadPoolExecutor(max_workers=len(STRESS_TESTS), initializer=_open_worker_session,
+                                initargs=(sessions,)) as executor:
+            futures = [executor.submit(_post_stress_test, payload) for _, payload in payloads]
+    finally:
+        for session in sessions:
+            session.close()
+    
+    for i, (test, (flood_risk_val, _), future) in enumerate(zip(STRESS_TESTS, payloads, futures)):
         print(f"\n[TEST {i+1}] {test['name']}")
         print("-" * 80)
         print(f"Question: {test['question']}")
         
-        # FIX: Match QueryRequest schema from main.py
-        # question (required), city, flood_risk, disease, confidence at top level
-        # is_verified, previous_state, and hospital_capacity go in dashboard_state
-        flood_risk_val = test['context'].get('flood_risk', 0.5)
-        payload = {
-            "question": test['question'],  # FIX: Use "question" not "query"
-            "city": "Miami",
-            # Risk metrics at top level (only fields in QueryRequest model)
-            "flood_risk": flood_risk_val,
-            "confidence": 0.95,
-            "disease": test['context'].get('disease', None),
-            "predicted_disease": test['context'].get('disease', None),  # Also set predicted_disease
-            # All other data in dashboard_state (as expected by main.py)
-            "dashboard_state": {
-                "previous_state": test['context'].get('previous_state', None),
-                "is_verified": test['context'].get('is_verified', True),
-                "flood_risk": flood_risk_val,  # Ensure it's in dashboard_state too
-                "hospital_capacity": 0.5
-            }
-        }
-        
         print(f"[DEBUG] Payload flood_risk: {flood_risk_val}")
 
         try:
-            # Send request
-            response = requests.post(API_URL, json=payload, timeout=45)
-            response.raise_for_status()
-            result = response.json()
+            result = future.result()
             
             # Parse Result - Extract from response text
             response_text = result.get('response', '')
@@ -481,8 +543,7 @@ def run_stress_test():
             
             # Extract decision from "SYSTEM DECISION: {decision}" line
             decision = 'UNKNOWN'
-            import re
-            decision_match = re.search(r'SYSTEM DECISION:\s*([^\n]+)', response_text, re.IGNORECASE)
+            decision_match = _DECISION_RE.search(response_text)
             if decision_match:
                 decision = decision_match.group(1).strip().upper()
             else:
@@ -497,7 +558,7 @@ def run_stress_test():
             
             # Extract risk_score from "Risk Score: {risk_score}" line
             risk = 0.0
-            risk_match = re.search(r'Risk Score:\s*([\d.]+)', response_text, re.IGNORECASE)
+            risk_match = _RISK_RE.search(response_text)
             if risk_match:
                 try:
                     risk = float(risk_match.group(1))
@@ -509,18 +570,10 @@ def run_stress_test():
             print(f"   Risk Level: {risk_level}")
             print(f"   Risk Score: {risk}")
             
-            # Validation Logic
-            status = "[FAIL]"
+            # Validation Logic: pass if the decision names any of the scenario's keywords
             decision_upper = decision.upper()
-            if i == 0: # Scenario 1: Expect Downgrade/Revoke
-                if "DOWNGRADE" in decision_upper or "REVOKE" in decision_upper:
-                    status = "[PASS]"
-            elif i == 1: # Scenario 2: Expect Hold/Medical
-                if "HOLD" in decision_upper or "MEDICAL" in decision_upper or "NORMAL" in decision_upper:
-                    status = "[PASS]"
-            elif i == 2: # Scenario 3: Expect Evacuate/High Alert
-                if "EVACUATE" in decision_upper or "INITIATE" in decision_upper:
-                    status = "[PASS]"
+            passed = any(keyword in decision_upper for keyword in test['pass_keywords'])
+            status = "[PASS]" if passed else "[FAIL]"
             
             print(f"   Validation: {status}")
 
@@ -528,7 +581,6 @@ def run_stress_test():
             print(f"[ERROR] Test failed - {e}")
         
         print("-" * 80)
-        time.sleep(2) # Brief pause
 
     print("\n[DONE] Stress test complete.")
 
@@ -575,5 +627,8 @@ def main():
             sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        _SESSION.close()
 
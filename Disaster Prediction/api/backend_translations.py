@@ -10,6 +10,8 @@ SAFE ACCESS RULE:
     translated = t.get(key, BACKEND_TRANSLATIONS["en"].get(key, key))
 """
 
+from functools import lru_cache
+
 BACKEND_TRANSLATIONS = {
     "en": {
         # Demo scenario recommendations
@@ -188,6 +190,8 @@ BACKEND_TRANSLATIONS = {
 }
 
 
+# Recommendation texts and language codes are a small closed set, so results are memoized
+@lru_cache(maxsize=4096)
 def translate_recommendation(recommendation: str, language_code: str) -> str:
     """
     Translate a backend-generated recommendation string.
@@ -25,7 +25,7 @@ def _ensure_cheseal_path():
     
     if cheseal_path_str not in sys.path:
         sys.path.insert(0, cheseal_path_str)
-        logger.debug(f"Added CHESEAL path to sys.path: {cheseal_path_str}")
+        logger.debug("Added CHESEAL path to sys.path: %s", cheseal_path_str)
 
 
 def _initialize_cheseal() -> bool:
@@ -146,7 +146,7 @@ def analyze_decision(question: str, risk_vector: Dict[str, Any], language: Optio
         }
         
     except Exception as e:
-        logger.error(f"CHESEAL analysis error: {e}", exc_info=True)
+        logger.error("CHESEAL analysis error: %s", e, exc_info=True)
         # Fail-safe: Return safe default response
         return {
             "decision": "INSUFFICIENT DATA",
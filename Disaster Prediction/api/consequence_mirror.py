@@ -379,6 +379,7 @@ class ConsequenceInput(BaseModel):
     hazard: Optional[str] = Field(None, description="Hazard/disaster type (e.g., Flood, Cyclone)")
     location: Optional[str] = Field(None, description="Location identifier")
     risk_vector: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Risk vector dictionary")
+    language: str = Field("en", description="Language code for multilingual output (e.g., 'en', 'de', 'hi', 'es')")
 
 
 class ConsequenceProjectionResponse(BaseModel):
@@ -422,14 +423,15 @@ def project_consequences_endpoint(payload: ConsequenceInput):
     
     # Only project for elevated risk states
     risk_level_upper = payload.risk_level.upper()
-    if not any(elevated in risk_level_upper for elevated in ["ALERT", "HIGH ALERT", "ESCALATED", "CRITICAL"]):
+    # "ALERT" also covers "HIGH ALERT"; three substring checks, no list/generator per request
+    if not ("ALERT" in risk_level_upper or "ESCALATED" in risk_level_upper or "CRITICAL" in risk_level_upper):
         raise HTTPException(
             status_code=400,
             detail="Consequence projection only available for elevated risk states (ALERT, HIGH ALERT, ESCALATED, CRITICAL)"
         )
     
     # Project consequences with language support
-    language = payload.language or "en"
+    language = payload.language
     result = project_consequences(context, language=language)
     
     if not result:
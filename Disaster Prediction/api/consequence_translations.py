@@ -5,6 +5,8 @@ Provides language-specific templates for impact statements and infrastructure st
 Numbers, dates, and metrics are NOT translated - only the template text.
 """
 
+from functools import lru_cache
+
 # Phase names by language
 PHASE_TRANSLATIONS = {
     "en": {"immediate": "Immediate", "secondary": "Secondary", "long_term": "Long-term"},
@@ -124,6 +126,7 @@ INFRASTRUCTURE_STATUS_TRANSLATIONS = {
 }
 
 
+@lru_cache(maxsize=256)
 def translate_phase(phase: str, language_code: str) -> str:
     """Translate phase name."""
     lang = language_code.lower() if language_code else "en"
@@ -158,6 +161,7 @@ def translate_impact_statement(statement: str, language_code: str) -> str:
     return statement
 
 
+@lru_cache(maxsize=256)
 def translate_infrastructure_status(status: str, language_code: str) -> str:
     """Translate infrastructure status, preserving status semantics."""
     if not status:
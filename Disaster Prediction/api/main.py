@@ -5,8 +5,12 @@ Provides real-time and batch prediction endpoints.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from pathlib import Path
+from bisect import bisect_right
+import asyncio
 import sys
+import numpy as np
 
 from api.schemas import (
     FloodPredictionRequest, FloodPredictionResponse,
@@ -14,8 +18,19 @@ from api.schemas import (
     CombinedPredictionRequest, CombinedPredictionResponse,
     BatchPredictionRequest, BatchPredictionResponse,
     HealthResponse, DiseaseRisks,
-    DecisionAnalysisRequest, DecisionAnalysisResponse
+    DecisionAnalysisRequest, DecisionAnalysisResponse,
+    ConsequenceProjection, ConsequenceHorizon
 )
+from api.backend_translations import translate_recommendations_list
+from api.consequence_mirror import project_consequences
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up models and CHESEAL before the app starts serving requests."""
+    await warm_up()
+    yield
+
 
 # FastAPI app
 app = FastAPI(
@@ -38,7 +53,8 @@ app = FastAPI(
     """,
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware for web dashboard
@@ -58,16 +74,32 @@ app.add_middleware(
 from api.consequence_mirror import router as consequence_router
 app.include_router(consequence_router)
 
+# Risk-level buckets: probability -> label via one bisect instead of an if/elif ladder
+_FLOOD_RISK_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+_FLOOD_RISK_LEVELS = ("LOW", "MODERATE", "HIGH", "VERY HIGH", "CRITICAL")
+_DISEASE_RISK_THRESHOLDS = (0.2, 0.4, 0.6)
+_DISEASE_RISK_LEVELS = ("LOW", "MODERATE", "HIGH", "VERY HIGH")
+
+# Risk levels that trigger a consequence projection
+_ELEVATED_RISK_LEVELS = frozenset({"HIGH", "VERY HIGH", "CRITICAL"})
+_ELEVATED_DECISION_STATES = frozenset({
+    "ALERT", "HIGH ALERT", "HEALTH ALERT", "ENVIRONMENTAL ALERT", "ESCALATED", "CRITICAL"
+})
+
 # Global model reference
 _models = None
 
+# Feature column order, resolved once when models load
+_FLOOD_COLUMNS: tuple = ()
+_DISEASE_COLUMNS: tuple = ()
+
 # CHESEAL service (lazy initialization)
 _cheseal_initialized = False
 
 
 def get_models():
-    """Lazy load models to avoid startup delay."""
-    global _models
+    """Load models once (at startup warm-up) and return the cached predictor."""
+    global _models, _FLOOD_COLUMNS, _DISEASE_COLUMNS
     if _models is None:
         try:
             # Add parent directory to path for models import (external dependency)
@@ -77,6 +109,8 @@ def get_models():
             from models.combined_predictor import CombinedPredictor
             models_dir = Path(__file__).parent.parent / "models" / "saved"
             _models = CombinedPredictor.from_saved_models(models_dir)
+            _FLOOD_COLUMNS = tuple(_models.flood_pipeline.feature_columns)
+            _DISEASE_COLUMNS = tuple(_models.disease_pipeline.feature_columns)
             print("✓ Models loaded successfully")
         except Exception as e:
             print(f"❌ Error loading models: {e}")
@@ -84,6 +118,20 @@ def get_models():
     return _models
 
 
+def build_consequence_projection(consequence_dict: dict) -> ConsequenceProjection:
+    """
+    Wrap project_consequences() output in response models without re-validating.
+    
+    The dict is produced internally by Consequence Mirror, so model_construct
+    is used instead of the validating constructors.
+    """
+    return ConsequenceProjection.model_construct(
+        day_0=ConsequenceHorizon.model_construct(**consequence_dict["day_0"]),
+        day_10=ConsequenceHorizon.model_construct(**consequence_dict["day_10"]),
+        day_30=ConsequenceHorizon.model_construct(**consequence_dict["day_30"])
+    )
+
+
 def convert_request_to_model_input(request: CombinedPredictionRequest) -> dict:
     """Convert API request to model input format."""
     return {
@@ -111,6 +159,36 @@ def convert_request_to_model_input(request: CombinedPredictionRequest) -> dict:
     }
 
 
+# Minimal request used to exercise the inference path once at startup
+_DUMMY_REQUEST = CombinedPredictionRequest(monsoon_intensity=5)
+
+
+async def warm_up():
+    """
+    Pre-warm models and CHESEAL so the first real request does not pay
+    one-time load/compile latency.
+
+    Fail-safe: warm-up errors are logged and never block startup.
+    """
+    try:
+        models = get_models()
+        models.predict(convert_request_to_model_input(_DUMMY_REQUEST))
+        print("✓ Models warmed up")
+    except Exception as e:
+        print(f"Warning: Model warm-up failed: {e}")
+
+    try:
+        from api.cheseal_service import analyze_decision as cheseal_analyze
+        # analyze_decision reports failures as a FAIL_SAFE result instead of raising
+        result = cheseal_analyze("warmup", {"flood_risk": 0.1}, language="en")
+        if result.get("validation") == "FAIL_SAFE":
+            print(f"Warning: CHESEAL warm-up failed: {result.get('explanation')}")
+        else:
+            print("✓ CHESEAL warmed up")
+    except Exception as e:
+        print(f"Warning: CHESEAL warm-up failed: {e}")
+
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint - API health check."""
@@ -155,29 +233,15 @@ async def predict_flood(request: FloodPredictionRequest):
         'PoliticalFactors': request.political_factors
     }
     
-    import pandas as pd
-    flood_features = pd.DataFrame([input_data])
-    
-    # Ensure all required features
-    for col in models.flood_pipeline.feature_columns:
-        if col not in flood_features.columns:
-            flood_features[col] = 5
-    
-    flood_features = flood_features[models.flood_pipeline.feature_columns]
-    X = models.flood_pipeline.scaler.transform(flood_features.values)
-    flood_prob = float(models.flood_model.predict(X)[0])
+    # Single-row feature vector in model column order (missing features default to 5)
+    flood_features = np.fromiter(
+        (input_data.get(col, 5) for col in _FLOOD_COLUMNS),
+        dtype=np.float64, count=len(_FLOOD_COLUMNS)
+    ).reshape(1, -1)
+    flood_prob = float(models.predict_flood_probability(flood_features)[0])
     
     # Determine risk level
-    if flood_prob < 0.2:
-        risk = "LOW"
-    elif flood_prob < 0.4:
-        risk = "MODERATE"
-    elif flood_prob < 0.6:
-        risk = "HIGH"
-    elif flood_prob < 0.8:
-        risk = "VERY HIGH"
-    else:
-        risk = "CRITICAL"
+    risk = _FLOOD_RISK_LEVELS[bisect_right(_FLOOD_RISK_THRESHOLDS, flood_prob)]
     
     return FloodPredictionResponse(
         flood_probability=flood_prob,
@@ -195,7 +259,6 @@ async def predict_disease(request: DiseasePredictionRequest):
     """
     models = get_models()
     
-    import pandas as pd
     disease_input = {
         'MonsoonIntensity': request.monsoon_intensity,
         'FloodProbability': request.flood_probability,
@@ -205,28 +268,24 @@ async def predict_disease(request: DiseasePredictionRequest):
         'PreparednessScore': request.preparedness_score
     }
     
-    disease_features = pd.DataFrame([disease_input])
-    disease_features = disease_features[models.disease_pipeline.feature_columns]
-    X = models.disease_pipeline.scaler.transform(disease_features.values)
+    disease_features = np.fromiter(
+        (disease_input[col] for col in _DISEASE_COLUMNS),
+        dtype=np.float64, count=len(_DISEASE_COLUMNS)
+    ).reshape(1, -1)
     
-    predictions = models.disease_model.predict(X)[0]
-    overall = float(sum(predictions) / len(predictions))
+    predictions = models.predict_disease_risks(disease_features)[0]
+    overall = float(predictions.mean())
     
-    if overall < 0.2:
-        risk = "LOW"
-    elif overall < 0.4:
-        risk = "MODERATE"
-    elif overall < 0.6:
-        risk = "HIGH"
-    else:
-        risk = "VERY HIGH"
+    risk = _DISEASE_RISK_LEVELS[bisect_right(_DISEASE_RISK_THRESHOLDS, overall)]
+    
+    malaria, cholera, leptospirosis, hepatitis = predictions.tolist()
     
     return DiseasePredictionResponse(
         disease_risks=DiseaseRisks(
-            malaria=float(predictions[0]),
-            cholera=float(predictions[1]),
-            leptospirosis=float(predictions[2]),
-            hepatitis=float(predictions[3])
+            malaria=malaria,
+            cholera=cholera,
+            leptospirosis=leptospirosis,
+            hepatitis=hepatitis
         ),
         overall_risk=overall,
         risk_level=risk
@@ -247,9 +306,6 @@ async def predict_combined(request: CombinedPredictionRequest):
     
     Supports demo scenarios via optional demo_scenario parameter (LOW, MEDIUM, HIGH).
     """
-    # Import translation function
-    from api.backend_translations import translate_recommendations_list
-    
     # Check for demo scenario
     if request.demo_scenario:
         # Demo mode: deterministic values, skip ML inference
@@ -274,7 +330,6 @@ async def predict_combined(request: CombinedPredictionRequest):
             flood_risk_level = "HIGH"
             # For HIGH scenario, generate consequence projection
             try:
-                from api.consequence_mirror import project_consequences
                 context = {
                     "risk_level": risk_level,
                     "risk_score": overall_risk,
@@ -286,14 +341,10 @@ async def predict_combined(request: CombinedPredictionRequest):
                     "disaster_type": "Flood"
                 }
                 # Extract language from request for multilingual CASCADE generation
-                language = getattr(request, 'language', 'en')
+                language = request.language
                 consequence_dict = project_consequences(context, language=language)
                 if consequence_dict:
-                    consequence_projection = ConsequenceProjection(
-                        day_0=ConsequenceHorizon(**consequence_dict["day_0"]),
-                        day_10=ConsequenceHorizon(**consequence_dict["day_10"]),
-                        day_30=ConsequenceHorizon(**consequence_dict["day_30"])
-                    )
+                    consequence_projection = build_consequence_projection(consequence_dict)
                 else:
                     consequence_projection = None
             except Exception as e:
@@ -317,7 +368,7 @@ async def predict_combined(request: CombinedPredictionRequest):
                 disease_risk_level=risk_level,
                 recommendations=translate_recommendations_list(
                     ["Monitor conditions", "Maintain preparedness"],
-                    getattr(request, 'language', 'en')
+                    request.language
                 ),
                 consequence_projection=consequence_projection
             )
@@ -325,7 +376,8 @@ async def predict_combined(request: CombinedPredictionRequest):
     # Real prediction mode: execute existing logic unchanged
     models = get_models()
     input_data = convert_request_to_model_input(request)
-    result = models.predict(input_data)
+    # Inference is CPU-bound; keep it off the event loop
+    result = await asyncio.to_thread(models.predict, input_data)
     
     # Determine if consequence projection should be included (risk >= threshold)
     risk_level = result['disease_risk_level'].upper()
@@ -333,10 +385,8 @@ async def predict_combined(request: CombinedPredictionRequest):
     consequence_projection = None
     
     # Include consequences for elevated risk states (HIGH, VERY HIGH, CRITICAL, or risk_score >= 0.6)
-    if any(elevated in risk_level for elevated in ["HIGH", "CRITICAL"]) or overall_risk >= 0.6:
+    if overall_risk >= 0.6 or risk_level in _ELEVATED_RISK_LEVELS:
         try:
-            from api.consequence_mirror import project_consequences
-            
             # Build context for consequence projection
             context = {
                 "risk_level": result['disease_risk_level'],
@@ -351,23 +401,19 @@ async def predict_combined(request: CombinedPredictionRequest):
             
             # Project consequences (fail-safe: returns empty dict on error)
             # Extract language from request for multilingual CASCADE generation
-            language = getattr(request, 'language', 'en')
+            language = request.language
             consequence_dict = project_consequences(context, language=language)
             
             # Only include consequences if projection succeeded
             if consequence_dict:
-                consequence_projection = ConsequenceProjection(
-                    day_0=ConsequenceHorizon(**consequence_dict["day_0"]),
-                    day_10=ConsequenceHorizon(**consequence_dict["day_10"]),
-                    day_30=ConsequenceHorizon(**consequence_dict["day_30"])
-                )
+                consequence_projection = build_consequence_projection(consequence_dict)
         except Exception as e:
             # Fail-safe: Consequence projection errors do not break the response
             print(f"Warning: Consequence projection failed: {e}")
             consequence_projection = None
     
     # Translate recommendations if language is provided
-    language = getattr(request, 'language', 'en')
+    language = request.language
     translated_recommendations = translate_recommendations_list(
         result['recommendations'],
         language
@@ -394,15 +440,13 @@ async def batch_predict(request: BatchPredictionRequest):
     models = get_models()
     results = []
     
-    # Import translation function
-    from api.backend_translations import translate_recommendations_list
+    # Run the whole batch in one worker thread instead of blocking the event loop
+    inputs = [convert_request_to_model_input(pred_request) for pred_request in request.predictions]
+    raw_results = await asyncio.to_thread(models.predict_batch, inputs)
     
-    for pred_request in request.predictions:
-        input_data = convert_request_to_model_input(pred_request)
-        result = models.predict(input_data)
-        
+    for pred_request, result in zip(request.predictions, raw_results):
         # Translate recommendations for each request
-        language = getattr(pred_request, 'language', 'en')
+        language = pred_request.language
         translated_recommendations = translate_recommendations_list(
             result['recommendations'],
             language
@@ -449,7 +493,7 @@ async def analyze_decision(request: DecisionAnalysisRequest):
     - `validation`: Validation status (OK, FAIL_SAFE, DEGRADED)
     """
     # Lazy import to avoid startup issues if CHESEAL has dependency problems
-    # CHESEAL is NOT initialized during /health - only when this endpoint is called
+    # CHESEAL is pre-warmed at startup (see warm_up); /health never touches it
     try:
         from api.cheseal_service import analyze_decision as cheseal_analyze
     except ImportError as e:
@@ -465,10 +509,12 @@ async def analyze_decision(request: DecisionAnalysisRequest):
     
     try:
         # Call CHESEAL service with fail-safe handling
-        # This is async-safe: CHESEAL runs in the same event loop
+        # CHESEAL is synchronous; run it in a worker thread so other requests proceed
         # Pass language parameter (defaults to "en" if not provided)
-        language = getattr(request, 'language', 'en')
-        result = cheseal_analyze(request.question, request.risk_vector, language=language)
+        language = request.language
+        result = await asyncio.to_thread(
+            cheseal_analyze, request.question, request.risk_vector, language=language
+        )
         
         # Extract decision data
         decision = result.get("decision", "INSUFFICIENT DATA")
@@ -481,10 +527,8 @@ async def analyze_decision(request: DecisionAnalysisRequest):
         # Conditionally project consequences for elevated risk states
         consequences = None
         risk_level_upper = risk_level.upper()
-        if any(elevated in risk_level_upper for elevated in ["ALERT", "HIGH ALERT", "ESCALATED", "CRITICAL"]):
+        if risk_level_upper in _ELEVATED_DECISION_STATES:
             try:
-                from api.consequence_mirror import project_consequences
-                
                 # Build context for consequence projection
                 context = {
                     "decision": decision,
@@ -500,12 +544,7 @@ async def analyze_decision(request: DecisionAnalysisRequest):
                 
                 # Only include consequences if projection succeeded
                 if consequence_dict:
-                    from api.schemas import ConsequenceProjection, ConsequenceHorizon
-                    consequences = ConsequenceProjection(
-                        day_0=ConsequenceHorizon(**consequence_dict["day_0"]),
-                        day_10=ConsequenceHorizon(**consequence_dict["day_10"]),
-                        day_30=ConsequenceHorizon(**consequence_dict["day_30"])
-                    )
+                    consequences = build_consequence_projection(consequence_dict)
             except Exception as e:
                 # Fail-safe: Consequence projection errors do not break the response
                 print(f"Warning: Consequence projection failed: {e}")
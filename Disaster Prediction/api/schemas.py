@@ -118,7 +118,7 @@ class CombinedPredictionRequest(BaseModel):
     inadequate_planning: float = Field(5, ge=1, le=10)
     political_factors: float = Field(5, ge=1, le=10)
     demo_scenario: Optional[str] = Field(None, description="Demo scenario: LOW, MEDIUM, or HIGH (for deterministic demo runs)")
-    language: Optional[str] = Field("en", description="Language code for multilingual output (e.g., 'en', 'de', 'hi', 'es')")
+    language: str = Field("en", description="Language code for multilingual output (e.g., 'en', 'de', 'hi', 'es')")
     
     @field_validator('demo_scenario')
     @classmethod
@@ -127,6 +127,12 @@ class CombinedPredictionRequest(BaseModel):
             raise ValueError('demo_scenario must be LOW, MEDIUM, or HIGH')
         return v.upper() if v is not None else None
     
+    @field_validator('language', mode='before')
+    @classmethod
+    def default_language(cls, v):
+        # Explicit null falls back to English so handlers can read request.language directly
+        return "en" if v is None else v
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -198,7 +204,7 @@ class DecisionAnalysisRequest(BaseModel):
     """
     
     question: str = Field(..., description="Question or scenario description for CHESEAL analysis")
-    language: Optional[str] = Field("en", description="Language code for multilingual output (e.g., 'en', 'de', 'hi', 'es')")
+    language: str = Field("en", description="Language code for multilingual output (e.g., 'en', 'de', 'hi', 'es')")
     risk_vector: Dict[str, Any] = Field(
         ...,
         description="Risk data dictionary containing numeric risk signals",
@@ -211,6 +217,12 @@ class DecisionAnalysisRequest(BaseModel):
         }
     )
     
+    @field_validator('language', mode='before')
+    @classmethod
+    def default_language(cls, v):
+        # Explicit null falls back to English so handlers can read request.language directly
+        return "en" if v is None else v
+    
     class Config:
         json_schema_extra = {
             "example": {
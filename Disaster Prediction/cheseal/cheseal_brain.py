@@ -5,8 +5,17 @@ Unified Code: Mega-Dictionary + Smart Triage + Safety Locks + Context Awareness
 
 import json
 import re
+import sys
+import threading
 import traceback
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick  # Optional accelerator (pyahocorasick)
+except ImportError:
+    ahocorasick = None
 
 # --- 1. UNIVERSAL KNOWLEDGE BASE (The Complete 500+ Word Dictionary) ---
 KNOWLEDGE_BASE = {
@@ -90,6 +99,73 @@ KNOWLEDGE_BASE = {
     ]
 }
 
+def _normalize_knowledge_base(knowledge_base: Dict[str, Any]) -> Dict[str, frozenset]:
+    """
+    Keywords are matched against lowercased input: normalize, intern and freeze them.
+    """
+    return {
+        category: frozenset(sys.intern(word.lower()) for word in keywords)
+        for category, keywords in knowledge_base.items()
+    }
+
+KNOWLEDGE_BASE = _normalize_knowledge_base(KNOWLEDGE_BASE)
+
+def _build_keyword_index() -> Dict[str, Tuple[str, ...]]:
+    """
+    Reverse index: keyword -> every category it belongs to (e.g. "burn" is both disaster and injury).
+    """
+    index = {}
+    for category, keywords in KNOWLEDGE_BASE.items():
+        for word in keywords:
+            index[word] = index.get(word, ()) + (category,)
+    return index
+
+_KW_TO_CAT = _build_keyword_index()
+
+def _build_containment_index() -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    """
+    (keyword, category) -> longer keywords of the same category that contain it (e.g. "anxi" in "anxiety").
+    A nested hit only scores when none of its containers matched, so one phrase counts once per category.
+    """
+    index = {}
+    for category, keywords in KNOWLEDGE_BASE.items():
+        for word in keywords:
+            containers = tuple(other for other in keywords if other != word and word in other)
+            if containers:
+                index[(word, category)] = containers
+    return index
+
+_KW_CONTAINERS = _build_containment_index()
+
+# Words analyze() reacts to directly (e.g. an explicit hospital request); they are matched in the
+# same keyword pass but do not score a category: word -> trigger name
+_TRIGGER_WORDS = {"hospital": "hospital", "doctor": "hospital", "chocolate": "chocolate", "coclates": "chocolate"}
+
+def _build_match_index() -> Dict[str, Tuple[str, ...]]:
+    """
+    Everything the keyword pass looks for: KNOWLEDGE_BASE keywords plus trigger-only words (no categories).
+    """
+    return {**dict.fromkeys(_TRIGGER_WORDS, ()), **_KW_TO_CAT}
+
+_MATCH_INDEX = _build_match_index()
+
+# Built once so per-call code iterates plain tuples instead of dict views
+_CATEGORY_KEYS = tuple(KNOWLEDGE_BASE)
+_KW_ITEMS = tuple(_MATCH_INDEX.items())
+
+# Category groups behind the classify_intent() flags (a flag is set when any member category matched)
+_MEDICAL_CATEGORIES = frozenset({
+    # Infectious
+    "MEDICAL_INFECTIOUS_VECTOR", "MEDICAL_INFECTIOUS_WATER_FOOD", "MEDICAL_INFECTIOUS_AIRBORNE", "MEDICAL_SYMPTOMS_GENERAL",
+    # Internal
+    "MEDICAL_GASTRO", "MEDICAL_CARDIAC", "MEDICAL_RESPIRATORY_CHRONIC", "MEDICAL_NEURO",
+    # Trauma
+    "MEDICAL_TRAUMA", "MEDICAL_ENVIRONMENTAL_INJURY",
+    "MENTAL_HEALTH"
+})
+_ENVIRONMENTAL_CATEGORIES = frozenset({"ENVIRONMENTAL_DISASTER", "CBRN_HAZARD", "ENVIRONMENTAL_EXTREME_COLD"})
+_RESPIRATORY_CATEGORIES = frozenset({"MEDICAL_INFECTIOUS_AIRBORNE", "MEDICAL_RESPIRATORY_CHRONIC"})
+
 # --- 2. ACTION PROTOCOLS (The Medical Logic) ---
 PROTOCOLS = {
     "EVACUATE": ["INITIATE IMMEDIATE EVACUATION", "Follow Designated Routes"],
@@ -104,7 +180,104 @@ PROTOCOLS = {
     "MEDICAL_WATER": ["Sip ORS (Rehydration Salts) Slowly", "Seek IV Fluids if Vomiting Persists", "Stop Solid Foods"]
 }
 
+# Protocol steps are only read and extended into actions: freeze them as tuples of interned strings
+PROTOCOLS = {name: tuple(sys.intern(step) for step in steps) for name, steps in PROTOCOLS.items()}
+
+# --- 3. KEYWORD AUTOMATON (Single-Pass Matching) ---
+def _build_keyword_automaton():
+    """
+    Compiles every KNOWLEDGE_BASE keyword and trigger word into one Aho-Corasick automaton.
+    Each word maps to (word, categories) taken from _MATCH_INDEX.
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for word, categories in _MATCH_INDEX.items():
+        automaton.add_word(word, (word, categories))
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+def _match_keywords(text: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Every distinct keyword or trigger word in already-lowercased text, mapped to its categories.
+    """
+    if _KEYWORD_AUTOMATON is not None:
+        # Single pass over the text; repeated hits of a keyword collapse into one entry
+        return {word: categories for _, (word, categories) in _KEYWORD_AUTOMATON.iter(text)}
+    # One scan per distinct keyword. A lookahead regex alternation gives the same hits
+    # but is slower than this for ~240 short keywords.
+    return {word: categories for word, categories in _KW_ITEMS if word in text}
+
+def classify(text: str) -> Set[str]:
+    """
+    Returns the set of KNOWLEDGE_BASE categories with at least one keyword in the text.
+    """
+    return {category for categories in _match_keywords(text.lower()).values() for category in categories}
+
+# --- 4. RESULT CACHES (Repeated Dashboard Queries) ---
+# analyze() is deterministic on (question, normalized signals); keep the most recent results
+_ANALYZE_CACHE_SIZE = 128
+_ANALYZE_CACHE = OrderedDict()
+_ANALYZE_CACHE_LOCK = threading.Lock()
+
+def invalidate_cache() -> None:
+    """
+    Rebuilds the keyword indexes from the current KNOWLEDGE_BASE and drops cached classifications
+    and analyses (call after reloading KNOWLEDGE_BASE or PROTOCOLS).
+    """
+    global KNOWLEDGE_BASE, _KW_TO_CAT, _KW_CONTAINERS, _MATCH_INDEX, _CATEGORY_KEYS, _KW_ITEMS
+    global _KEYWORD_AUTOMATON, _EMPTY_SIGNALS
+
+    KNOWLEDGE_BASE = _normalize_knowledge_base(KNOWLEDGE_BASE)
+    _KW_TO_CAT = _build_keyword_index()
+    _KW_CONTAINERS = _build_containment_index()
+    _MATCH_INDEX = _build_match_index()
+    _CATEGORY_KEYS = tuple(KNOWLEDGE_BASE)
+    _KW_ITEMS = tuple(_MATCH_INDEX.items())
+    _KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+    ChesealBrain._classify_lowered.cache_clear()
+    _EMPTY_SIGNALS = ChesealBrain._classify_lowered.__wrapped__("")
+    with _ANALYZE_CACHE_LOCK:
+        _ANALYZE_CACHE.clear()
+
+@lru_cache(maxsize=1024, typed=True)
+def _normalize_key(key: Any) -> str:
+    """
+    Signal key -> lowercase snake_case ("Flood Risk" -> "flood_risk"). Dashboards reuse a small key set.
+    """
+    return str(key).lower().replace(" ", "_")
+
+# Signal aliases read by calculate_risk(), in priority order
+_FLOOD_KEYS = ("flood_risk", "flood")
+_HOSPITAL_KEYS = ("hospital_capacity", "icu_capacity")
+
+def _get_val(risk_vector: Dict[str, Any], keys: Tuple[str, ...], default: float = 0.5) -> float:
+    """
+    First signal under `keys` that converts to float; numbers skip the try/except path.
+    """
+    for k in keys:
+        v = risk_vector.get(k)
+        if v is None:
+            continue
+        if type(v) is float:
+            return v
+        if type(v) is int:
+            return float(v)
+        try:
+            return float(v)
+        except Exception:
+            continue
+    return default
+
 class ChesealBrain:
+    # Stateless engine: caches and the keyword automaton are module-level, so instances carry no __dict__
+    __slots__ = ()
+
     def __init__(self):
         print("[SYSTEM] [BRAIN] Omni-Neural Engine Initialized.")
 
@@ -112,39 +285,49 @@ class ChesealBrain:
         """
         Classifies user input against the Knowledge Base.
         """
-        text = text.lower()
-        scores = {k: 0 for k in KNOWLEDGE_BASE.keys()}
-        detected_keywords = []
+        signals = self._classify_lowered(text.lower())
+        # Cached result is shared; hand callers their own copy
+        return dict(signals, scores=dict(signals["scores"]))
 
-        for category, keywords in KNOWLEDGE_BASE.items():
-            for word in keywords:
-                if word in text:
-                    scores[category] += 1
-                    detected_keywords.append(word)
-        
-        # Logic Groups
-        is_infectious = (scores["MEDICAL_INFECTIOUS_VECTOR"] + scores["MEDICAL_INFECTIOUS_WATER_FOOD"] +
-                         scores["MEDICAL_INFECTIOUS_AIRBORNE"] + scores["MEDICAL_SYMPTOMS_GENERAL"])
-        
-        is_internal = (scores["MEDICAL_GASTRO"] + scores["MEDICAL_CARDIAC"] + 
-                       scores["MEDICAL_RESPIRATORY_CHRONIC"] + scores["MEDICAL_NEURO"])
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _classify_lowered(text: str) -> Dict[str, Any]:
+        """
+        classify_intent() for text that is already lowercased. Results are cached and must not be mutated.
+        """
+        scores = dict.fromkeys(_CATEGORY_KEYS, 0)
+        detected_keywords = []
 
-        is_trauma = scores["MEDICAL_TRAUMA"] + scores["MEDICAL_ENVIRONMENTAL_INJURY"]
-        
-        env_total = scores["ENVIRONMENTAL_DISASTER"] + scores["CBRN_HAZARD"] + scores["ENVIRONMENTAL_EXTREME_COLD"]
+        matched = set()
+
+        # Each distinct keyword counts once; shared keywords score every category they belong to.
+        # Longest match wins within a category: "anxiety" scores once, not again for "anxi"/"anxiet".
+        matches = _match_keywords(text)
+        for word, categories in matches.items():
+            for category in categories:
+                containers = _KW_CONTAINERS.get((word, category))
+                if containers and any(longer in matches for longer in containers):
+                    continue
+                scores[category] += 1
+                detected_keywords.append(word)
+            matched.update(categories)
+
+        triggers = frozenset(_TRIGGER_WORDS[word] for word in matches if word in _TRIGGER_WORDS)
         
+        # Logic Groups: set intersections instead of summing category scores
         return {
-            "is_medical": (is_infectious + is_internal + is_trauma + scores["MENTAL_HEALTH"]) > 0,
-            "is_environmental": env_total > 0,
-            "is_cold": scores["ENVIRONMENTAL_EXTREME_COLD"] > 0,
-            "is_heat": scores["ENVIRONMENTAL_EXTREME_HEAT"] > 0,
-            "is_mental": scores["MENTAL_HEALTH"] > 0,
-            "is_gastro": scores["MEDICAL_GASTRO"] > 0,
-            "is_cardiac": scores["MEDICAL_CARDIAC"] > 0,
-            "is_neuro": scores["MEDICAL_NEURO"] > 0,
-            "is_respiratory": (scores["MEDICAL_INFECTIOUS_AIRBORNE"] + scores["MEDICAL_RESPIRATORY_CHRONIC"]) > 0,
-            "is_activity": scores["HIGH_RISK_ACTIVITIES"] > 0,
-            "is_prevention": scores["PREVENTION_INTENT"] > 0,
+            "is_medical": not matched.isdisjoint(_MEDICAL_CATEGORIES),
+            "is_environmental": not matched.isdisjoint(_ENVIRONMENTAL_CATEGORIES),
+            "is_cold": "ENVIRONMENTAL_EXTREME_COLD" in matched,
+            "is_heat": "ENVIRONMENTAL_EXTREME_HEAT" in matched,
+            "is_mental": "MENTAL_HEALTH" in matched,
+            "is_gastro": "MEDICAL_GASTRO" in matched,
+            "is_cardiac": "MEDICAL_CARDIAC" in matched,
+            "is_neuro": "MEDICAL_NEURO" in matched,
+            "is_respiratory": not matched.isdisjoint(_RESPIRATORY_CATEGORIES),
+            "is_activity": "HIGH_RISK_ACTIVITIES" in matched,
+            "is_prevention": "PREVENTION_INTENT" in matched,
+            "triggers": triggers,
             "scores": scores
         }
 
@@ -159,15 +342,8 @@ class ChesealBrain:
         source_label = "System Default"
 
         try:
-            def get_val(keys, default=0.5):
-                for k in keys:
-                    if risk_vector.get(k) is not None:
-                        try: return float(risk_vector[k])
-                        except: continue
-                return default
-
-            flood_val = get_val(["flood_risk", "flood"])
-            hosp_val = get_val(["hospital_capacity", "icu_capacity"])
+            flood_val = _get_val(risk_vector, _FLOOD_KEYS)
+            hosp_val = _get_val(risk_vector, _HOSPITAL_KEYS)
             
             final_flood = flood_val if is_verified else (flood_val * 0.5) + 0.25
             source_label = "Verified Sensor" if is_verified else "Inference"
@@ -221,14 +397,49 @@ class ChesealBrain:
         """
         
         # 1. Input Normalization
-        raw_inputs = {}
-        if dashboard_state: raw_inputs.update(dashboard_state)
-        if context_data: raw_inputs.update(context_data)
-        if risk_vector: raw_inputs.update(risk_vector)
-        api_signals = {str(k).lower().replace(" ", "_"): v for k, v in raw_inputs.items()}
-        
-        # 2. Classification & Risk Calc
-        text_signals = self.classify_intent(user_question)
+        # Later sources override earlier ones; with a single source (the API path) skip the merge copy
+        sources = [src for src in (dashboard_state, context_data, risk_vector) if src]
+        if len(sources) == 1 and type(sources[0]) is dict:
+            raw_inputs = sources[0]
+        else:
+            raw_inputs = {}
+            for src in sources: raw_inputs.update(src)
+        api_signals = {_normalize_key(k): v for k, v in raw_inputs.items()}
+
+        try:
+            cache_key = (user_question, json.dumps(api_signals, sort_keys=True, default=str))
+        except (TypeError, ValueError):
+            cache_key = None  # Unserializable signals: skip the cache
+
+        if cache_key is not None:
+            with _ANALYZE_CACHE_LOCK:
+                cached = _ANALYZE_CACHE.get(cache_key)
+                if cached is not None:
+                    _ANALYZE_CACHE.move_to_end(cache_key)
+            if cached is not None:
+                return dict(cached, action_items=list(cached["action_items"]))
+
+        result = self._analyze_signals(user_question, api_signals)
+
+        if cache_key is not None:
+            with _ANALYZE_CACHE_LOCK:
+                _ANALYZE_CACHE[cache_key] = result
+                if len(_ANALYZE_CACHE) > _ANALYZE_CACHE_SIZE:
+                    _ANALYZE_CACHE.popitem(last=False)
+            return dict(result, action_items=list(result["action_items"]))
+        return result
+
+    def _analyze_signals(self, user_question: str, api_signals: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        analyze() body once inputs are merged into normalized api_signals.
+        """
+        # 2. Classification & Risk Calc (lowercase the question exactly once)
+        question_lower = user_question.lower()
+        # Blank questions (dashboard polls) cannot match any keyword: skip the keyword pass
+        if question_lower.strip():
+            text_signals = self._classify_lowered(question_lower)
+        else:
+            text_signals = _EMPTY_SIGNALS
         final_vector = text_signals.copy()
         final_vector.update(api_signals)
         
@@ -238,18 +449,18 @@ class ChesealBrain:
         
         actions = []
         scores = text_signals.get("scores", {})
-        question_lower = user_question.lower()
+        triggers = text_signals["triggers"]
 
         # --- A. MEDICAL TRIAGE LOGIC ---
         if final_vector.get("is_medical") or final_vector.get("is_prevention"):
             
             # EXPLICIT HOSPITAL REQUEST
-            if "hospital" in question_lower or "doctor" in question_lower:
+            if "hospital" in triggers:
                 actions.insert(0, "GO TO NEAREST EMERGENCY ROOM (ER)")
             
             # GASTRO (Vomiting/Diarrhea/Chocolates) - PRIORITY OVER RESPIRATORY
             if final_vector.get("is_gastro") or scores.get("MEDICAL_INFECTIOUS_WATER_FOOD"):
-                if "chocolate" in question_lower or "coclates" in question_lower:
+                if "chocolate" in triggers:
                     actions.append("Monitor Blood Sugar (Possible Spike)")
                 
                 # If vomiting/water/food is detected, use the improved protocol
@@ -259,19 +470,22 @@ class ChesealBrain:
                 if final_vector.get("is_gastro"):
                     actions.extend(PROTOCOLS["MEDICAL_GASTRO"])
 
-            # NEURO (Dizziness)
-            if final_vector.get("is_neuro"):
-                actions.extend(["Sit or Lie Down Immediately", "Drink Water (if conscious)", "Monitor Consciousness"])
+            # Blocks below only append and just the first 3 unique actions are kept:
+            # skip them once 3 are collected (the activity check still runs, it can prepend)
+            if len(set(actions)) < 3:
+                # NEURO (Dizziness)
+                if final_vector.get("is_neuro"):
+                    actions.extend(("Sit or Lie Down Immediately", "Drink Water (if conscious)", "Monitor Consciousness"))
 
-            # MENTAL
-            if final_vector.get("is_mental"): actions.extend(["Box Breathing (4-4-4)", "Find Quiet Space"])
-            
-            # RESPIRATORY - ONLY IF NOT VOMITING (Choke Risk)
-            if final_vector.get("is_respiratory") and not (final_vector.get("is_gastro") or scores.get("MEDICAL_INFECTIOUS_WATER_FOOD")): 
-                actions.extend(["Sit Upright", "Monitor Oxygen", "Isolate"])
-            
-            # INFECTIOUS VECTOR
-            if scores.get("MEDICAL_INFECTIOUS_VECTOR"): actions.extend(PROTOCOLS["MEDICAL_VECTOR"])
+                # MENTAL
+                if final_vector.get("is_mental"): actions.extend(("Box Breathing (4-4-4)", "Find Quiet Space"))
+                
+                # RESPIRATORY - ONLY IF NOT VOMITING (Choke Risk)
+                if final_vector.get("is_respiratory") and not (final_vector.get("is_gastro") or scores.get("MEDICAL_INFECTIOUS_WATER_FOOD")): 
+                    actions.extend(("Sit Upright", "Monitor Oxygen", "Isolate"))
+                
+                # INFECTIOUS VECTOR
+                if scores.get("MEDICAL_INFECTIOUS_VECTOR"): actions.extend(PROTOCOLS["MEDICAL_VECTOR"])
             
             # ACTIVITY SAFETY CHECK (Contraindications)
             if final_vector.get("is_activity"):
@@ -333,6 +547,9 @@ IMMEDIATE ACTIONS:
             "system_status": "OPTIMAL"
         }
 
+# Classification of a question with no keywords, shared by every blank analyze() call
+_EMPTY_SIGNALS = ChesealBrain._classify_lowered.__wrapped__("")
+
 # Initialize global instance
 cheseal = None
 
@@ -30,7 +30,7 @@ def get_cheseal_brain():
             _cheseal_brain = ChesealBrain()
             logger.info("CHESEAL Brain initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize CHESEAL Brain: {e}", exc_info=True)
+            logger.error("Failed to initialize CHESEAL Brain: %s", e, exc_info=True)
             # Fail-safe: Return None instead of crashing
             _cheseal_brain = None
     
@@ -126,7 +126,7 @@ def analyze_decision(risk_vector: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"CHESEAL analysis failed: {e}", exc_info=True)
+        logger.error("CHESEAL analysis failed: %s", e, exc_info=True)
         # Fail-safe: Return safe default response
         return {
             "decision": "INSUFFICIENT DATA",
@@ -7,6 +7,7 @@ This module provides deterministic, fail-fast normalization functions
 for safety-critical decision engine inputs.
 """
 
+import warnings
 from typing import Any, Optional, Literal
 
 # ✅ CANONICAL VERIFICATION STATUS ENUM
@@ -15,6 +16,21 @@ VERIFICATION_VERIFIED = "VERIFIED"
 VERIFICATION_UNVERIFIED = "UNVERIFIED"
 VerificationStatus = Literal["VERIFIED", "UNVERIFIED"]
 
+# Accepted is_verified values -> status (strings are matched uppercased, for backward compatibility)
+_VERIFICATION_LOOKUP = {
+    True: VERIFICATION_VERIFIED,
+    False: VERIFICATION_UNVERIFIED,
+    "VERIFIED": VERIFICATION_VERIFIED,
+    "TRUE": VERIFICATION_VERIFIED,
+    "1": VERIFICATION_VERIFIED,
+    "UNVERIFIED": VERIFICATION_UNVERIFIED,
+    "FALSE": VERIFICATION_UNVERIFIED,
+    "0": VERIFICATION_UNVERIFIED,
+}
+
+# Keys that must be accessed via normalizer only (see guard_inputs)
+_FORBIDDEN_KEYS = frozenset({"is_verified"})
+
 
 def normalize_float(value: Any, field_name: str) -> Optional[float]:
     """
@@ -112,16 +128,14 @@ def get_verification_status_enum(data: dict) -> VerificationStatus:
     if value is None:
         return VERIFICATION_UNVERIFIED  # UNVERIFIED (missing verification = unverified)
     
-    if isinstance(value, bool):
-        return VERIFICATION_VERIFIED if value else VERIFICATION_UNVERIFIED
+    if type(value) is bool:
+        return _VERIFICATION_LOOKUP[value]
     
     # Check for string values (for backward compatibility)
     if isinstance(value, str):
-        value_upper = value.upper()
-        if value_upper in ("VERIFIED", "TRUE", "1"):
-            return VERIFICATION_VERIFIED
-        elif value_upper in ("UNVERIFIED", "FALSE", "0"):
-            return VERIFICATION_UNVERIFIED
+        status = _VERIFICATION_LOOKUP.get(value.upper())
+        if status is not None:
+            return status
     
     # Invalid type - default to UNVERIFIED (safe default)
     print(f"[WARNING] Invalid is_verified value: {value} ({type(value).__name__}) - defaulting to UNVERIFIED")
@@ -215,18 +229,15 @@ def guard_inputs(data: dict) -> None:
     Raises:
         RuntimeError: If forbidden keys are accessed directly
     """
-    FORBIDDEN_KEYS = ["is_verified"]  # Keys that must be accessed via normalizer only
-    
     # This function is called BEFORE decision logic to ensure no direct access
     # If forbidden keys exist, they should be extracted via normalizer first
     # We don't raise here - we just log a warning if they exist
     # The real protection is that code should use normalizers, not direct access
-    for key in FORBIDDEN_KEYS:
-        if key in data:
-            # Log warning but don't crash - the key exists, but should be accessed via normalizer
-            import warnings
-            warnings.warn(
-                f"Key '{key}' found in raw input. Use get_verification_status() instead of direct access.",
-                UserWarning
-            )
+    # One set intersection instead of a membership test per forbidden key
+    for key in sorted(_FORBIDDEN_KEYS.intersection(data)):
+        # Log warning but don't crash - the key exists, but should be accessed via normalizer
+        warnings.warn(
+            f"Key '{key}' found in raw input. Use get_verification_status() instead of direct access.",
+            UserWarning
+        )
 
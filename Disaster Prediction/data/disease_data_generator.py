@@ -4,9 +4,14 @@ Generates synthetic disease outbreak data correlated with flood conditions.
 Based on WHO and CDC documented epidemiological correlations.
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from data.data_loader import save_frame
 
 
 def generate_disease_data(flood_df: pd.DataFrame, seed: int = 42) -> pd.DataFrame:
@@ -49,11 +54,13 @@ def generate_disease_data(flood_df: pd.DataFrame, seed: int = 42) -> pd.DataFram
         poor_preparedness = np.random.uniform(0.2, 0.8, n_samples)
     
     flood_prob = flood_df['FloodProbability'].values
+    # Poor drainage feeds malaria, cholera, leptospirosis and hepatitis risk; compute it once
+    poor_drainage = 1 - drainage
     
     # --- Malaria Risk ---
     # Increases with stagnant water (poor drainage + high monsoon)
     # Research: 30% increased risk in flood-prone areas
-    stagnant_water_factor = (1 - drainage) * monsoon
+    stagnant_water_factor = poor_drainage * monsoon
     temperature_factor = np.random.uniform(0.6, 1.0, n_samples)  # Tropical temps
     base_malaria = 0.15  # Base endemic rate
     malaria_risk = base_malaria + (0.35 * stagnant_water_factor * temperature_factor) + (0.20 * flood_prob)
@@ -62,7 +69,7 @@ def generate_disease_data(flood_df: pd.DataFrame, seed: int = 42) -> pd.DataFram
     # --- Cholera Risk ---
     # Increases with water contamination and urban density
     # Spikes after infrastructure damage
-    contamination_factor = flood_prob * (1 - drainage) * urbanization
+    contamination_factor = flood_prob * poor_drainage * urbanization
     infrastructure_damage = poor_preparedness * flood_prob
     base_cholera = 0.05  # Base rate
     cholera_risk = base_cholera + (0.40 * contamination_factor) + (0.25 * infrastructure_damage)
@@ -71,7 +78,7 @@ def generate_disease_data(flood_df: pd.DataFrame, seed: int = 42) -> pd.DataFram
     # --- Leptospirosis Risk ---
     # Increases with flood duration and population exposure
     # Often from contact with contaminated water
-    exposure_factor = flood_prob * urbanization * (1 - drainage)
+    exposure_factor = flood_prob * urbanization * poor_drainage
     environmental_factor = deforestation * siltation
     base_lepto = 0.03
     leptospirosis_risk = base_lepto + (0.30 * exposure_factor) + (0.15 * environmental_factor)
@@ -79,7 +86,7 @@ def generate_disease_data(flood_df: pd.DataFrame, seed: int = 42) -> pd.DataFram
     
     # --- Hepatitis A/E Risk ---
     # Linked to sanitation breakdown and fecal-oral transmission
-    sanitation_breakdown = poor_preparedness * flood_prob * (1 - drainage)
+    sanitation_breakdown = poor_preparedness * flood_prob * poor_drainage
     overcrowding_factor = urbanization * flood_prob  # Displacement into shelters
     base_hepatitis = 0.02
     hepatitis_risk = base_hepatitis + (0.25 * sanitation_breakdown) + (0.15 * overcrowding_factor)
@@ -113,14 +120,14 @@ def generate_disease_data(flood_df: pd.DataFrame, seed: int = 42) -> pd.DataFram
     return disease_df
 
 
-def main():
-    """Generate and save disease outbreak data."""
+def main(write_csv: bool = False):
+    """Generate and save disease outbreak data (Parquet by default, CSV if write_csv)."""
     # Load flood data
     project_root = Path(__file__).parent.parent
     flood_path = project_root / "flood.csv"
     
     print(f"Loading flood data from: {flood_path}")
-    flood_df = pd.read_csv(flood_path)
+    flood_df = load_frame(flood_path)
     print(f"Flood data shape: {flood_df.shape}")
     print(f"Columns: {list(flood_df.columns)}")
     
@@ -134,8 +141,8 @@ def main():
     processed_dir.mkdir(parents=True, exist_ok=True)
     
     output_path = processed_dir / "disease_outbreak_data.csv"
-    disease_df.to_csv(output_path, index=False)
-    print(f"\nSaved disease data to: {output_path}")
+    saved_path = save_frame(disease_df, output_path, write_csv)
+    print(f"\nSaved disease data to: {saved_path}")
     
     # Print summary statistics
     print("\n--- Disease Risk Summary ---")
@@ -145,11 +152,13 @@ def main():
     # Also create a combined dataset with all features
     combined_df = pd.concat([flood_df, disease_df.drop(columns=['MonsoonIntensity', 'FloodProbability'])], axis=1)
     combined_path = processed_dir / "combined_disaster_disease_data.csv"
-    combined_df.to_csv(combined_path, index=False)
-    print(f"\nSaved combined data to: {combined_path}")
+    saved_path = save_frame(combined_df, combined_path, write_csv)
+    print(f"\nSaved combined data to: {saved_path}")
     
     return disease_df
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate synthetic disease outbreak data")
+    parser.add_argument('--csv', action='store_true', help="write CSV instead of Parquet")
+    main(write_csv=parser.parse_args().csv)
@@ -15,6 +15,62 @@ from data.data_loader import DataLoader, get_data_loader
 logger = logging.getLogger(__name__)
 
 
+def _lowercase_columns(df: pd.DataFrame) -> List[Tuple[str, str]]:
+    """(column, lowercased column) pairs, so keyword scans lower each name once."""
+    return [(col, col.lower()) for col in df.columns]
+
+
+def _normalize_names(series: pd.Series) -> pd.Series:
+    """
+    Lowercased, stripped string keys for city/country joins.
+    
+    Same result as series.astype(str).str.lower().str.strip(), but the string work is done
+    once per distinct name (a handful of cities repeat across millions of readings).
+    """
+    codes, uniques = pd.factorize(series.astype(str), use_na_sentinel=False)
+    return pd.Series(uniques.str.lower().str.strip().take(codes), index=series.index)
+
+
+def _group_means(df: pd.DataFrame, keys: List[str], value_cols: List[str]) -> pd.DataFrame:
+    """
+    Per-group means of value_cols, like df.groupby(keys)[value_cols].mean().reset_index().
+
+    Keys are factorized and the sums/counts accumulated with np.bincount, skipping rows with
+    a missing key and NaN values as groupby does. Groups come out in first-seen order.
+    """
+    key_codes, key_levels = [], []
+    for key in keys:
+        codes, uniques = pd.factorize(df[key])
+        key_codes.append(codes)
+        key_levels.append(uniques)
+
+    # Mixed-radix composite key; rows with any missing key part are dropped
+    shape = tuple(max(len(uniques), 1) for uniques in key_levels)
+    flat = np.zeros(len(df), dtype=np.int64)
+    valid = np.ones(len(df), dtype=bool)
+    for codes, size in zip(key_codes, shape):
+        flat = flat * size + codes
+        valid &= codes >= 0
+    all_valid = valid.all()
+    if not all_valid:
+        flat = flat[valid]
+    group_codes, group_flat = pd.factorize(flat)
+    n_groups = len(group_flat)
+
+    level_codes = np.unravel_index(group_flat, shape)
+    result = {key: uniques.take(codes) for key, uniques, codes in zip(keys, key_levels, level_codes)}
+    for col in value_cols:
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        if not all_valid:
+            values = values[valid]
+        present = ~np.isnan(values)
+        sums = np.bincount(group_codes, weights=np.where(present, values, 0.0), minlength=n_groups)
+        counts = np.bincount(group_codes, weights=present, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[col] = sums / counts
+    return pd.DataFrame(result)
+
+
 class FeatureHarmonizer:
     """
     Harmonizes features across datasets:
@@ -79,10 +135,13 @@ class FeatureHarmonizer:
         - AQI (no conversion needed, already standardized)
         - Cases (no conversion needed)
         """
-        df = df.copy()
+        # Shallow copy: stages only add or replace whole columns, which never writes into
+        # the caller's arrays, so the input frame stays untouched without duplicating its data
+        df = df.copy(deep=False)
+        columns = _lowercase_columns(df)
         
         # Rainfall normalization (to mm)
-        rainfall_cols = [col for col in df.columns if 'rain' in col.lower() or 'precipitation' in col.lower()]
+        rainfall_cols = [col for col, low in columns if 'rain' in low or 'precipitation' in low]
         for col in rainfall_cols:
             if df[col].dtype in [np.float64, np.int64, np.float32, np.int32]:
                 # Assume already in mm if values are reasonable (0-2000mm)
@@ -91,18 +150,19 @@ class FeatureHarmonizer:
                     logger.warning(f"Large rainfall values in {col}, assuming mm")
         
         # Wind speed normalization (to km/h)
-        wind_cols = [col for col in df.columns if 'wind' in col.lower() and 'speed' in col.lower()]
+        wind_cols = [col for col, low in columns if 'wind' in low and 'speed' in low]
         for col in wind_cols:
             if df[col].dtype in [np.float64, np.int64, np.float32, np.int32]:
+                col_max = df[col].max()
                 # Check if values are reasonable for km/h (typically 0-300)
-                if df[col].max() > 500:  # Possibly in m/s or knots
+                if col_max > 500:  # Possibly in m/s or knots
                     # Convert from m/s (multiply by 3.6) if max < 100
-                    if df[col].max() < 100:
+                    if col_max < 100:
                         df[col] = df[col] * 3.6
                         logger.info(f"Converted {col} from m/s to km/h")
         
         # Temperature normalization (to Celsius)
-        temp_cols = [col for col in df.columns if 'temp' in col.lower() and 'uncertainty' not in col.lower()]
+        temp_cols = [col for col, low in columns if 'temp' in low and 'uncertainty' not in low]
         for col in temp_cols:
             if df[col].dtype in [np.float64, np.int64, np.float32, np.int32]:
                 # Check if values are in Fahrenheit (typically > 50 for tropical regions)
@@ -142,13 +202,29 @@ class FeatureHarmonizer:
         except:
             return None
     
+    def parse_timestamps(self, series: pd.Series) -> pd.Series:
+        """
+        Series version of parse_timestamp (same result as series.apply(self.parse_timestamp)).
+        
+        Datetime columns are converted to UTC directly; anything else is parsed once per
+        distinct value, since date columns repeat heavily (one value per event day, station
+        update, etc.).
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.tz_localize('UTC') if series.dt.tz is None else series.dt.tz_convert('UTC')
+        
+        codes, uniques = pd.factorize(series)
+        parsed = [self.parse_timestamp(value) for value in uniques]
+        # Code -1 marks missing values, which parse_timestamp maps to None
+        return pd.Series([parsed[code] if code >= 0 else None for code in codes], index=series.index)
+    
     def align_temporal_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Align temporal data - convert all timestamps to UTC.
         
         Looks for columns like: date, time, timestamp, year, month, day, dt
         """
-        df = df.copy()
+        df = df.copy(deep=False)
         
         # Find temporal columns
         temporal_patterns = ['date', 'time', 'timestamp', 'dt', 'year', 'month', 'day']
@@ -162,26 +238,26 @@ class FeatureHarmonizer:
         # Create unified timestamp column
         if 'year' in df.columns:
             # Construct date from year/month/day
-            date_parts = []
-            if 'year' in df.columns:
-                date_parts.append(df['year'].astype(str))
-            if 'month' in df.columns:
-                month = df['month'].fillna(1).astype(int).astype(str).str.zfill(2)
-                date_parts.append(month)
-            else:
-                date_parts.append('01')
-            if 'day' in df.columns:
-                day = df['day'].fillna(1).astype(int).astype(str).str.zfill(2)
-                date_parts.append(day)
-            else:
-                date_parts.append('01')
+            year = df['year']
+            month = df['month'].fillna(1).astype(int) if 'month' in df.columns else 1
+            day = df['day'].fillna(1).astype(int) if 'day' in df.columns else 1
             
-            date_str = date_parts[0] + '-' + date_parts[1] + '-' + date_parts[2]
-            df['_timestamp'] = pd.to_datetime(date_str, errors='coerce', utc=True)
+            if pd.api.types.is_integer_dtype(year) and not year.hasnans and year.between(1000, 9999).all():
+                # Plain four-digit integer years: assemble the dates directly instead of
+                # formatting and re-parsing a string per row
+                parts = pd.DataFrame({'year': year, 'month': month, 'day': day}, index=df.index)
+                df['_timestamp'] = pd.to_datetime(parts, errors='coerce', utc=True)
+            else:
+                date_parts = [year.astype(str)]
+                for part in (month, day):
+                    date_parts.append(part.astype(str).str.zfill(2) if isinstance(part, pd.Series) else '01')
+                
+                date_str = date_parts[0] + '-' + date_parts[1] + '-' + date_parts[2]
+                df['_timestamp'] = pd.to_datetime(date_str, errors='coerce', utc=True)
         else:
             # Try to parse existing date columns
             for col in temporal_cols[:1]:  # Use first temporal column
-                df['_timestamp'] = df[col].apply(self.parse_timestamp)
+                df['_timestamp'] = self.parse_timestamps(df[col])
                 break
         
         return df
@@ -193,27 +269,35 @@ class FeatureHarmonizer:
         - trend_14d (if temporal data available)
         - Statistical features (mean, std, min, max for grouped data)
         """
-        df = df.copy()
+        df = df.copy(deep=False)
         
         # Only create temporal features if timestamp exists
         if '_timestamp' in df.columns and not df['_timestamp'].isna().all():
             df = df.sort_values('_timestamp')
             
-            # Create lag features for numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            # Exclude metadata and timestamp columns
-            numeric_cols = [col for col in numeric_cols if not col.startswith('_meta') and col != '_timestamp']
+            # Create lag features for real-valued numeric columns
+            numeric_cols = df.select_dtypes(include=[np.floating, np.integer]).columns.tolist()
+            # Exclude metadata and timestamp columns, and names that select more than one column
+            duplicated = set(df.columns[df.columns.duplicated()])
+            numeric_cols = [col for col in numeric_cols
+                            if not col.startswith('_meta') and col != '_timestamp' and col not in duplicated]
             
-            for col in numeric_cols[:10]:  # Limit to first 10 numeric cols to avoid explosion
-                try:
-                    # 3-day lag
-                    df[f'{col}_lag_3d'] = df[col].shift(3)
-                    # 7-day lag
-                    df[f'{col}_lag_7d'] = df[col].shift(7)
-                    # 14-day rolling mean (trend)
-                    df[f'{col}_trend_14d'] = df[col].rolling(window=14, min_periods=1).mean()
-                except:
-                    pass  # Skip if column causes issues
+            lag_cols = numeric_cols[:10]  # Limit to first 10 numeric cols to avoid explosion
+            if lag_cols:
+                # Shift/roll the numeric block at once and add all derived columns in one
+                # concat instead of 30 single-column inserts
+                numeric = df[lag_cols]
+                lag_3d = numeric.shift(3)  # 3-day lag
+                lag_7d = numeric.shift(7)  # 7-day lag
+                trend_14d = numeric.rolling(window=14, min_periods=1).mean()  # 14-day rolling mean (trend)
+                
+                derived = {}
+                for col in lag_cols:
+                    derived[f'{col}_lag_3d'] = lag_3d[col]
+                    derived[f'{col}_lag_7d'] = lag_7d[col]
+                    derived[f'{col}_trend_14d'] = trend_14d[col]
+                derived = pd.DataFrame(derived, index=df.index)
+                df = pd.concat([df.drop(columns=derived.columns, errors='ignore'), derived], axis=1)
         
         return df
     
@@ -254,9 +338,9 @@ class FeatureHarmonizer:
         
         # Normalize city names (lowercase, strip)
         if 'city' in temp_df.columns:
-            temp_df['_city_normalized'] = temp_df['city'].astype(str).str.lower().str.strip()
+            temp_df['_city_normalized'] = _normalize_names(temp_df['city'])
         if 'country' in temp_df.columns:
-            temp_df['_country_normalized'] = temp_df['country'].astype(str).str.lower().str.strip()
+            temp_df['_country_normalized'] = _normalize_names(temp_df['country'])
         
         self.temperature_data = temp_df
         return temp_df
@@ -269,20 +353,16 @@ class FeatureHarmonizer:
         Join temperature data by (city, month, year).
         Falls back to regional mean if city missing.
         """
-        df = df.copy()
-        temp_df = self.load_temperature_data()
-        
-        if temp_df.empty:
-            logger.warning("Cannot join climate data: temperature dataset is empty")
-            return df
+        df = df.copy(deep=False)
         
         # Find city/country/year/month columns in df
+        columns = _lowercase_columns(df)
         if city_col is None:
-            city_candidates = [col for col in df.columns if 'city' in col.lower() or 'region' in col.lower() or 'location' in col.lower()]
+            city_candidates = [col for col, low in columns if 'city' in low or 'region' in low or 'location' in low]
             city_col = city_candidates[0] if city_candidates else None
         
         if country_col is None:
-            country_candidates = [col for col in df.columns if 'country' in col.lower()]
+            country_candidates = [col for col, low in columns if 'country' in low]
             country_col = country_candidates[0] if country_candidates else None
         
         if year_col is None:
@@ -291,6 +371,17 @@ class FeatureHarmonizer:
         if month_col is None:
             month_col = 'month' if 'month' in df.columns else None
         
+        # No city to join on and no year/month to extract: the frame comes back unchanged,
+        # so don't look up (or warn about) the temperature data
+        if city_col is None and not ('_timestamp' in df.columns and year_col is None):
+            return df
+        
+        temp_df = self.load_temperature_data()
+        
+        if temp_df.empty:
+            logger.warning("Cannot join climate data: temperature dataset is empty")
+            return df
+        
         # If we have temporal data, extract year/month
         if '_timestamp' in df.columns and year_col is None:
             df['_join_year'] = df['_timestamp'].dt.year
@@ -301,15 +392,15 @@ class FeatureHarmonizer:
         # Prepare join keys
         if city_col and year_col and month_col:
             # Normalize city names
-            df['_city_join'] = df[city_col].astype(str).str.lower().str.strip()
+            df['_city_join'] = _normalize_names(df[city_col])
             df['_year_join'] = df[year_col].astype(int) if year_col in df.columns else None
             df['_month_join'] = df[month_col].astype(int) if month_col in df.columns else None
             
             # Aggregate temperature data by city, year, month
-            temp_agg = temp_df.groupby(['_city_normalized', '_year', '_month']).agg({
-                'average_temperature': 'mean',
-                'average_temperature_uncertainty': 'mean'
-            }).reset_index()
+            temp_agg = _group_means(
+                temp_df, ['_city_normalized', '_year', '_month'],
+                ['average_temperature', 'average_temperature_uncertainty']
+            )
             temp_agg.columns = ['_city_normalized', '_year', '_month', 'avg_temp_celsius', 'temp_uncertainty']
             
             # Join
@@ -322,7 +413,7 @@ class FeatureHarmonizer:
             
             # Fill missing with regional mean (by country if available)
             if country_col and 'avg_temp_celsius' in merged.columns:
-                country_temp = temp_df.groupby(['_country_normalized', '_year', '_month'])['average_temperature'].mean().reset_index()
+                country_temp = _group_means(temp_df, ['_country_normalized', '_year', '_month'], ['average_temperature'])
                 country_temp.columns = ['_country_normalized', '_year', '_month', 'country_avg_temp']
                 
                 merged = merged.merge(
@@ -354,34 +445,36 @@ class FeatureHarmonizer:
         - water_contamination_index
         - population_exposed_estimate
         """
-        df = df.copy()
+        df = df.copy(deep=False)
+        # Added interaction columns never match the later patterns, so one listing serves all scans
+        columns = _lowercase_columns(df)
         
         # Flood-Cholera interaction
-        flood_cols = [col for col in df.columns if 'flood' in col.lower() and ('risk' in col.lower() or 'prob' in col.lower())]
-        cholera_cols = [col for col in df.columns if 'cholera' in col.lower() and ('risk' in col.lower() or 'case' in col.lower() or 'incidence' in col.lower())]
+        flood_cols = [col for col, low in columns if 'flood' in low and ('risk' in low or 'prob' in low)]
+        cholera_cols = [col for col, low in columns if 'cholera' in low and ('risk' in low or 'case' in low or 'incidence' in low)]
         if flood_cols and cholera_cols:
             df['flood_cholera_interaction'] = df[flood_cols[0]] * df[cholera_cols[0]]
         
         # Cyclone-Diarrhea interaction
-        cyclone_cols = [col for col in df.columns if 'cyclone' in col.lower() and ('intensity' in col.lower() or 'wind' in col.lower())]
-        diarrhea_cols = [col for col in df.columns if 'diarrhea' in col.lower() and ('risk' in col.lower() or 'case' in col.lower())]
+        cyclone_cols = [col for col, low in columns if 'cyclone' in low and ('intensity' in low or 'wind' in low)]
+        diarrhea_cols = [col for col, low in columns if 'diarrhea' in low and ('risk' in low or 'case' in low)]
         if cyclone_cols and diarrhea_cols:
             df['cyclone_diarrhea_interaction'] = df[cyclone_cols[0]] * df[diarrhea_cols[0]]
         
         # Humidity-Respiratory interaction
-        humidity_cols = [col for col in df.columns if 'humidity' in col.lower()]
-        respiratory_cols = [col for col in df.columns if 'respiratory' in col.lower() and ('risk' in col.lower() or 'case' in col.lower())]
+        humidity_cols = [col for col, low in columns if 'humidity' in low]
+        respiratory_cols = [col for col, low in columns if 'respiratory' in low and ('risk' in low or 'case' in low)]
         if humidity_cols and respiratory_cols:
             df['humidity_respiratory_interaction'] = df[humidity_cols[0]] * df[respiratory_cols[0]]
         
         # Water contamination index (if available)
-        water_cols = [col for col in df.columns if 'water' in col.lower() and 'contamination' in col.lower()]
+        water_cols = [col for col, low in columns if 'water' in low and 'contamination' in low]
         if water_cols:
             df['water_contamination_index'] = df[water_cols[0]]
         
         # Population exposed estimate (if population and risk columns exist)
-        pop_cols = [col for col in df.columns if 'population' in col.lower()]
-        risk_cols = [col for col in df.columns if 'risk' in col.lower() and 'overall' not in col.lower()]
+        pop_cols = [col for col, low in columns if 'population' in low]
+        risk_cols = [col for col, low in columns if 'risk' in low and 'overall' not in low]
         if pop_cols and risk_cols:
             # Estimate exposed = population * average_risk
             avg_risk = df[risk_cols].mean(axis=1)
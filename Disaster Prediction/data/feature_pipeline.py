@@ -9,6 +9,7 @@ from pathlib import Path
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import joblib
+from data.data_loader import load_frame
 
 
 class FeaturePipeline:
@@ -150,9 +151,9 @@ def main():
     models_dir.mkdir(parents=True, exist_ok=True)
     
     # Load data
-    flood_df = pd.read_csv(project_root / "flood.csv")
-    disease_df = pd.read_csv(processed_dir / "disease_outbreak_data.csv")
-    combined_df = pd.read_csv(processed_dir / "combined_disaster_disease_data.csv")
+    flood_df = load_frame(project_root / "flood.csv")
+    disease_df = load_frame(processed_dir / "disease_outbreak_data.csv")
+    combined_df = load_frame(processed_dir / "combined_disaster_disease_data.csv")
     
     print("=" * 50)
     print("FLOOD DATA PREPARATION")
@@ -11,7 +11,15 @@ import logging
 import joblib
 from functools import lru_cache
 import hashlib
+import inspect
 import json
+import shutil
+
+# Harmonized datasets are cached on disk as Parquet only when pyarrow is available
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 from data.data_loader import DataLoader, get_data_loader
 from data.feature_harmonizer import FeatureHarmonizer
@@ -49,6 +57,7 @@ class UnifiedPipeline:
         self.harmonizer = FeatureHarmonizer(self.data_loader)
         
         # Cache for processed datasets
+        self._harmonized_cache: Optional[Dict[str, pd.DataFrame]] = None
         self._training_data_cache: Optional[pd.DataFrame] = None
         self._inference_data_cache: Optional[Dict[str, pd.DataFrame]] = None
         
@@ -57,6 +66,129 @@ class UnifiedPipeline:
         key_str = f"{operation}_{'_'.join(sorted(datasets))}"
         return hashlib.md5(key_str.encode()).hexdigest()
     
+    def _source_fingerprint(self) -> str:
+        """MD5 over the raw data files (path, size, mtime) and the loader/harmonizer code."""
+        hasher = hashlib.md5()
+        for path in sorted(self.data_dir.rglob('*')):
+            if path.suffix.lower() in ('.csv', '.xlsx'):
+                stat = path.stat()
+                hasher.update(f"{path.relative_to(self.data_dir)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+        for cls in (DataLoader, FeatureHarmonizer):
+            hasher.update(Path(inspect.getsourcefile(cls)).read_bytes())
+        hasher.update(pd.__version__.encode())
+        return hasher.hexdigest()
+    
+    def _read_harmonized_cache(self, cache_path: Path) -> Optional[Dict[str, pd.DataFrame]]:
+        """Load cached harmonized datasets and their loader metadata, or None on a miss."""
+        manifest_path = cache_path / 'manifest.json'
+        if not manifest_path.exists():
+            return None
+        
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            harmonized = {}
+            for name, dtypes in manifest['dtypes'].items():
+                df = pd.read_parquet(cache_path / f"{name}.parquet", engine='pyarrow')
+                for col, dtype in dtypes.items():
+                    if str(df[col].dtype) == dtype and not isinstance(df[col].dtype, pd.DatetimeTZDtype):
+                        continue
+                    target = pd.api.types.pandas_dtype(dtype)
+                    if isinstance(target, pd.DatetimeTZDtype):
+                        # Parquet reads UTC back as ZoneInfo('UTC'), which concat treats as
+                        # a different zone from the harmonizer's timezone.utc
+                        df[col] = df[col].dt.tz_convert(target.tz).dt.as_unit(target.unit)
+                    else:
+                        # e.g. second-resolution timestamps, which Parquet stores as milliseconds
+                        df[col] = df[col].astype(target)
+                harmonized[name] = df
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable harmonized cache {cache_path.name}: {e}")
+            return None
+        
+        # Lineage comes from the loader, which never ran on a cache hit
+        self.data_loader.metadata.update(manifest['metadata'])
+        return harmonized
+    
+    def _write_harmonized_cache(self, cache_path: Path, harmonized: Dict[str, pd.DataFrame]):
+        """Persist harmonized datasets as Parquet and drop caches of older sources/code."""
+        try:
+            cache_path.mkdir(parents=True, exist_ok=True)
+            for name, df in harmonized.items():
+                df.to_parquet(cache_path / f"{name}.parquet", engine='pyarrow', compression='zstd')
+            manifest = {
+                'dtypes': {name: {col: str(dtype) for col, dtype in df.dtypes.items()}
+                           for name, df in harmonized.items()},
+                'metadata': self.data_loader.get_metadata()
+            }
+            # Written last: a directory without a manifest is never read
+            (cache_path / 'manifest.json').write_text(json.dumps(manifest, default=str))
+        except Exception as e:
+            logger.warning(f"Could not cache harmonized datasets: {e}")
+            shutil.rmtree(cache_path, ignore_errors=True)
+            return
+        
+        for stale_path in self.cache_dir.glob('harmonized_*'):
+            if stale_path != cache_path:
+                shutil.rmtree(stale_path, ignore_errors=True)
+    
+    def _load_or_harmonize(self) -> Dict[str, pd.DataFrame]:
+        """
+        Harmonized datasets, shared by training and inference preparation.
+        
+        Kept in memory and, with pyarrow, on disk under cache_dir keyed by the source
+        fingerprint, so restarts skip loading and harmonizing unchanged data.
+        """
+        if self._harmonized_cache is not None:
+            return self._harmonized_cache
+        
+        cache_path = None
+        if pyarrow is not None:
+            cache_path = self.cache_dir / f"harmonized_{self._source_fingerprint()}"
+            harmonized = self._read_harmonized_cache(cache_path)
+            if harmonized is not None:
+                logger.info(f"Loaded {len(harmonized)} harmonized datasets from {cache_path}")
+                self._harmonized_cache = harmonized
+                return harmonized
+        
+        harmonized = self.harmonizer.harmonize_all_datasets()
+        if cache_path is not None:
+            self._write_harmonized_cache(cache_path, harmonized)
+        
+        self._harmonized_cache = harmonized
+        return harmonized
+    
+    def clear_cache(self):
+        """Drop the in-memory harmonized, training and inference data (the on-disk cache is kept)."""
+        self._harmonized_cache = None
+        self._training_data_cache = None
+        self._inference_data_cache = None
+    
+    def _count_duplicate_rows(self, df: pd.DataFrame) -> int:
+        """
+        Exact equivalent of df.duplicated().sum().
+        
+        A row can only duplicate another if it repeats in every column, so rows whose
+        float/datetime values are unique are dropped first and the full-row check runs
+        on what is left. Narrowing stops once a column no longer halves the candidates.
+        """
+        rows = None
+        for position, dtype in enumerate(df.dtypes):
+            if dtype.kind not in 'fM':
+                continue
+            values = df.iloc[:, position] if rows is None else df.iloc[rows, position]
+            repeated = values.duplicated(keep=False).to_numpy()
+            candidates = np.flatnonzero(repeated) if rows is None else rows[repeated]
+            shrunk = len(candidates) <= len(repeated) // 2
+            rows = candidates
+            if len(rows) == 0:
+                return 0
+            if not shrunk:
+                break
+        
+        if rows is None:
+            return int(df.duplicated().sum())
+        return int(df.iloc[rows].duplicated().sum())
+    
     def validate_dataset(self, df: pd.DataFrame, dataset_name: str) -> Tuple[bool, List[str]]:
         """
         Validate dataset quality.
@@ -78,7 +210,7 @@ class UnifiedPipeline:
             issues.append(f"High missing values in columns: {high_missing.index.tolist()}")
         
         # Check for duplicate rows
-        dupes = df.duplicated().sum()
+        dupes = self._count_duplicate_rows(df)
         if dupes > len(df) * 0.1:  # More than 10% duplicates
             issues.append(f"High duplicate ratio: {dupes}/{len(df)} ({dupes/len(df)*100:.1f}%)")
         
@@ -133,7 +265,7 @@ class UnifiedPipeline:
         logger.info("Preparing training data...")
         
         # Load and harmonize all datasets
-        harmonized = self.harmonizer.harmonize_all_datasets()
+        harmonized = self._load_or_harmonize()
         
         training_dfs = []
         
@@ -185,7 +317,7 @@ class UnifiedPipeline:
         
         logger.info("Preparing inference data (real data only)...")
         
-        harmonized = self.harmonizer.harmonize_all_datasets()
+        harmonized = self._load_or_harmonize()
         
         inference_datasets = {}
         
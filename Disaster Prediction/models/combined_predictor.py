@@ -1,63 +1,122 @@
-import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 import joblib
+import logging
 import sys
 
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+logger = logging.getLogger(__name__)
+
 
 class CombinedPredictor:
     
+    # (threshold, recommendations) per disease, in disease_model.DISEASE_NAMES order
+    DISEASE_RECOMMENDATIONS = (
+        (0.3, ("🦟 Deploy mosquito control measures (larva control, nets)",
+               "💊 Stock antimalarial medications")),
+        (0.2, ("💧 Ensure water chlorination and purification",
+               "🏥 Prepare oral rehydration supplies")),
+        (0.2, ("👢 Distribute protective gear for flood cleanup",
+               "🐀 Implement rodent control measures")),
+        (0.2, ("🧼 Enhance sanitation and hygiene facilities",
+               "💉 Consider hepatitis vaccination campaigns")),
+    )
+    
+    # Optional ONNX sessions (see models/onnx_export.py); class-level defaults keep old pickles loadable
+    flood_session = None
+    disease_session = None
+    
     def __init__(self, flood_model=None, disease_model=None, 
                  flood_pipeline=None, disease_pipeline=None):
         self.flood_model = flood_model
         self.disease_model = disease_model
         self.flood_pipeline = flood_pipeline
         self.disease_pipeline = disease_pipeline
+    
+    def __getstate__(self):
+        # InferenceSession is not picklable; from_saved_models recreates it
+        state = self.__dict__.copy()
+        state.pop('flood_session', None)
+        state.pop('disease_session', None)
+        return state
+    
+    def predict_flood_probability(self, X: np.ndarray) -> np.ndarray:
+        """Flood probability for unscaled rows in flood_pipeline.feature_columns order."""
+        if self.flood_session is not None:
+            predictions = self.flood_session.run(None, {'input': X.astype(np.float32)})[0].ravel()
+            return np.clip(predictions, 0, 1, out=predictions)
+        return self.flood_model.predict(self.flood_pipeline.scaler.transform(X))
+    
+    def predict_disease_risks(self, X: np.ndarray) -> np.ndarray:
+        """Disease risks for unscaled rows in disease_pipeline.feature_columns order."""
+        if self.disease_session is not None:
+            predictions = self.disease_session.run(None, {'input': X.astype(np.float32)})[0]
+            return np.clip(predictions, 0, 1, out=predictions)
+        return self.disease_model.predict(self.disease_pipeline.scaler.transform(X))
         
     def predict(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.predict_batch([input_data])[0]
+    
+    def predict_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predict many inputs with one flood and one disease model call for the whole batch."""
+        if not inputs:
+            return []
         
-        flood_features = pd.DataFrame([input_data])
+        flood_columns = self.flood_pipeline.feature_columns
+        flood_features = np.array(
+            [[input_data.get(col, 5) for col in flood_columns] for input_data in inputs],
+            dtype=np.float64
+        )
+        flood_probs = self.predict_flood_probability(flood_features)
         
-        for col in self.flood_pipeline.feature_columns:
-            if col not in flood_features.columns:
-                flood_features[col] = 5 
+        disease_columns = self.disease_pipeline.feature_columns
+        disease_rows = []
+        for input_data, flood_prob in zip(inputs, flood_probs):
+            disease_input = {
+                'MonsoonIntensity': input_data.get('MonsoonIntensity', 5),
+                'FloodProbability': float(flood_prob),
+                'DrainageScore': input_data.get('DrainageScore', 
+                                                input_data.get('DrainageSystems', 5)),
+                'UrbanizationScore': input_data.get('UrbanizationScore',
+                                                    input_data.get('Urbanization', 5)),
+                'DeforestationScore': input_data.get('DeforestationScore',
+                                                     input_data.get('Deforestation', 5)),
+                'PreparednessScore': input_data.get('PreparednessScore', 5)
+            }
+            disease_rows.append([disease_input[col] for col in disease_columns])
         
-        flood_features = flood_features[self.flood_pipeline.feature_columns]
-        X_flood = self.flood_pipeline.scaler.transform(flood_features.values)
-        flood_prob = float(self.flood_model.predict(X_flood)[0])
-
-        disease_input = {
-            'MonsoonIntensity': input_data.get('MonsoonIntensity', 5),
-            'FloodProbability': flood_prob,
-            'DrainageScore': input_data.get('DrainageScore', 
-                                            input_data.get('DrainageSystems', 5)),
-            'UrbanizationScore': input_data.get('UrbanizationScore',
-                                                input_data.get('Urbanization', 5)),
-            'DeforestationScore': input_data.get('DeforestationScore',
-                                                 input_data.get('Deforestation', 5)),
-            'PreparednessScore': input_data.get('PreparednessScore', 5)
-        }
+        disease_predictions = self.predict_disease_risks(np.array(disease_rows, dtype=np.float64))
+        overall_risks = disease_predictions.mean(axis=1)
+        
+        # Plain floats from here on: per-row NumPy scalar access dominates result building
+        return [
+            self._build_result(flood_prob, predictions, overall_risk)
+            for flood_prob, predictions, overall_risk in zip(
+                flood_probs.tolist(), disease_predictions.tolist(), overall_risks.tolist()
+            )
+        ]
+    
+    def _build_result(self, flood_prob: float, disease_predictions: List[float],
+                      overall_risk: float) -> Dict[str, Any]:
         
-        disease_features = pd.DataFrame([disease_input])
-        disease_features = disease_features[self.disease_pipeline.feature_columns]
-        X_disease = self.disease_pipeline.scaler.transform(disease_features.values)
-
-        disease_predictions = self.disease_model.predict(X_disease)[0]
-
         result = {
             'flood_probability': flood_prob,
             'flood_risk_level': self._get_risk_level(flood_prob),
             'disease_risks': {
-                'malaria': float(disease_predictions[0]),
-                'cholera': float(disease_predictions[1]),
-                'leptospirosis': float(disease_predictions[2]),
-                'hepatitis': float(disease_predictions[3])
+                'malaria': disease_predictions[0],
+                'cholera': disease_predictions[1],
+                'leptospirosis': disease_predictions[2],
+                'hepatitis': disease_predictions[3]
             },
-            'overall_disease_risk': float(np.mean(disease_predictions)),
-            'disease_risk_level': self._get_risk_level(np.mean(disease_predictions)),
+            'overall_disease_risk': overall_risk,
+            'disease_risk_level': self._get_risk_level(overall_risk),
             'recommendations': self._get_recommendations(flood_prob, disease_predictions)
         }
         
@@ -76,7 +135,7 @@ class CombinedPredictor:
         else:
             return 'CRITICAL'
     
-    def _get_recommendations(self, flood_prob: float, disease_risks: np.ndarray) -> list:
+    def _get_recommendations(self, flood_prob: float, disease_risks: List[float]) -> list:
         
         recommendations = []
       
@@ -87,23 +146,9 @@ class CombinedPredictor:
             recommendations.append("📢 Monitor water levels closely")
             recommendations.append("🏗️ Check drainage infrastructure")
         
-        malaria, cholera, lepto, hepatitis = disease_risks
-        
-        if malaria > 0.3:
-            recommendations.append("🦟 Deploy mosquito control measures (larva control, nets)")
-            recommendations.append("💊 Stock antimalarial medications")
-        
-        if cholera > 0.2:
-            recommendations.append("💧 Ensure water chlorination and purification")
-            recommendations.append("🏥 Prepare oral rehydration supplies")
-        
-        if lepto > 0.2:
-            recommendations.append("👢 Distribute protective gear for flood cleanup")
-            recommendations.append("🐀 Implement rodent control measures")
-        
-        if hepatitis > 0.2:
-            recommendations.append("🧼 Enhance sanitation and hygiene facilities")
-            recommendations.append("💉 Consider hepatitis vaccination campaigns")
+        for risk, (threshold, messages) in zip(disease_risks, self.DISEASE_RECOMMENDATIONS):
+            if risk > threshold:
+                recommendations.extend(messages)
         
         if not recommendations:
             recommendations.append("✅ Risk levels are low - maintain standard monitoring")
@@ -128,7 +173,46 @@ class CombinedPredictor:
         flood_pipeline = FeaturePipeline.load(models_dir / "flood_pipeline.joblib")
         disease_pipeline = FeaturePipeline.load(models_dir / "disease_pipeline.joblib")
         
-        return cls(flood_model, disease_model, flood_pipeline, disease_pipeline)
+        predictor = cls(flood_model, disease_model, flood_pipeline, disease_pipeline)
+        predictor.load_onnx_sessions(models_dir)
+        return predictor
+    
+    def load_onnx_sessions(self, models_dir: Path):
+        """
+        Use exported ONNX graphs when onnxruntime and the .onnx files are available.
+        
+        A graph is skipped unless it was exported from the joblib files currently in
+        models_dir, and a graph that fails to load falls back to sklearn. ONNX outputs
+        are float32 and differ from sklearn by about 1e-3, more where an input sits
+        on a tree split; models/onnx_export.py prints the measured drift after export.
+        """
+        from models.onnx_export import FLOOD_ONNX_FILE, DISEASE_ONNX_FILE
+        
+        if ort is None:
+            return
+        
+        self.flood_session = self._load_onnx_session(models_dir, FLOOD_ONNX_FILE)
+        self.disease_session = self._load_onnx_session(models_dir, DISEASE_ONNX_FILE)
+    
+    def _load_onnx_session(self, models_dir: Path, file_name: str):
+        from models.onnx_export import SOURCE_HASH_KEY, source_hash
+        
+        onnx_path = models_dir / file_name
+        if not onnx_path.exists():
+            return None
+        
+        try:
+            session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+        except Exception as e:
+            logger.warning("Ignoring %s: onnxruntime could not load it (%s); re-run models/onnx_export.py",
+                           file_name, e)
+            return None
+        exported_from = session.get_modelmeta().custom_metadata_map.get(SOURCE_HASH_KEY)
+        if exported_from != source_hash(models_dir, file_name):
+            logger.warning("Ignoring stale %s: it was not exported from the current joblib models; "
+                           "re-run models/onnx_export.py", file_name)
+            return None
+        return session
 
 
 def build_and_save():
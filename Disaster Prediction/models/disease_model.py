@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 from pathlib import Path
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
@@ -9,6 +8,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from data.feature_pipeline import prepare_disease_data
+from data.data_loader import load_frame
 
 
 class DiseasePredictor:
@@ -36,7 +36,7 @@ class DiseasePredictor:
             raise ValueError("Model must be fitted before prediction")
         
         predictions = self.model.predict(X)
-        return np.clip(predictions, 0, 1)
+        return np.clip(predictions, 0, 1, out=predictions)
     
     def predict_dict(self, X: np.ndarray) -> list:
         predictions = self.predict(X)
@@ -81,7 +81,7 @@ def train_and_save():
     processed_dir = project_root / "data" / "processed"
     
     print("Loading disease outbreak data...")
-    disease_df = pd.read_csv(processed_dir / "disease_outbreak_data.csv")
+    disease_df = load_frame(processed_dir / "disease_outbreak_data.csv")
     
     X_train, X_test, y_train, y_test, pipeline = prepare_disease_data(disease_df)
     
@@ -9,6 +9,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from data.feature_pipeline import prepare_flood_data
+from data.data_loader import load_frame
 
 
 class FloodPredictor:
@@ -55,7 +56,8 @@ class FloodPredictor:
             pred = model.predict(X)
             predictions += self.weights[name] * pred
         
-        return np.clip(predictions, 0, 1)
+        # predictions is our own buffer, so clip it in place rather than allocating another
+        return np.clip(predictions, 0, 1, out=predictions)
     
     def evaluate(self, X: np.ndarray, y: np.ndarray) -> dict:
         y_pred = self.predict(X)
@@ -87,7 +89,7 @@ def train_and_save():
     project_root = Path(__file__).parent.parent
     
     print("Loading flood data...")
-    flood_df = pd.read_csv(project_root / "flood.csv")
+    flood_df = load_frame(project_root / "flood.csv")
     
     X_train, X_test, y_train, y_test, pipeline = prepare_flood_data(flood_df)
     
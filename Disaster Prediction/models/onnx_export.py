@@ -0,0 +1,145 @@
+"""
+ONNX export for the flood and disease models.
+Folds each feature scaler into the model graph so inference is a single
+float32 InferenceSession.run instead of scaler.transform + model.predict.
+
+The graphs compute in float32, so their outputs drift from the float64 sklearn
+predictions: about 1e-3 for almost all inputs on the committed models, and up to
+~2e-2 on disease risk where a float32-rounded feature crosses a tree split
+threshold. export_and_save prints the measured drift on the held-out split of
+DRIFT_SAMPLE_FILE; inputs within that distance of a 0.2/0.4/0.6/0.8 boundary can
+land in a different risk level than sklearn gives.
+
+Each graph records an MD5 of the joblib files it was built from under
+SOURCE_HASH_KEY; CombinedPredictor.load_onnx_sessions skips graphs whose hash no
+longer matches, so a retrain without a re-export falls back to sklearn.
+"""
+
+import hashlib
+import numpy as np
+from pathlib import Path
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import VotingRegressor
+from sklearn.pipeline import Pipeline
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+FLOOD_ONNX_FILE = "flood_model.onnx"
+DISEASE_ONNX_FILE = "disease_model.onnx"
+ONNX_INPUT_NAME = "input"
+SOURCE_HASH_KEY = "source_joblib_md5"
+
+# Has both the flood and disease feature columns; the drift check uses the same
+# 20% held-out split as data/feature_pipeline.py
+DRIFT_SAMPLE_FILE = Path(__file__).parent.parent / "data" / "processed" / "combined_disaster_disease_data.csv"
+
+# joblib files each graph is built from
+ONNX_SOURCES = {
+    FLOOD_ONNX_FILE: ("flood_model.joblib", "flood_pipeline.joblib"),
+    DISEASE_ONNX_FILE: ("disease_model.joblib", "disease_pipeline.joblib"),
+}
+
+
+def source_hash(models_dir: Path, onnx_file: str) -> str:
+    """MD5 over the joblib files an ONNX graph is exported from."""
+    hasher = hashlib.md5()
+    for name in ONNX_SOURCES[onnx_file]:
+        with open(models_dir / name, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def build_flood_pipeline(flood_model, flood_pipeline) -> Pipeline:
+    """Express the weighted flood ensemble as scaler + VotingRegressor for conversion."""
+    names = list(flood_model.models)
+    ensemble = VotingRegressor(
+        [(name, flood_model.models[name]) for name in names],
+        weights=np.array([flood_model.weights[name] for name in names])
+    )
+    # Members are already fitted; VotingRegressor.predict only needs estimators_
+    ensemble.estimators_ = [flood_model.models[name] for name in names]
+    return Pipeline([('scaler', flood_pipeline.scaler), ('ensemble', ensemble)])
+
+
+def build_disease_pipeline(disease_model, disease_pipeline) -> Pipeline:
+    return Pipeline([('scaler', disease_pipeline.scaler), ('model', disease_model.model)])
+
+
+def _to_onnx(pipeline: Pipeline, n_features: int):
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    return convert_sklearn(
+        pipeline,
+        initial_types=[(ONNX_INPUT_NAME, FloatTensorType([None, n_features]))]
+    )
+
+
+def report_drift(exported: dict, predictor):
+    """Print the max and 99.9th-percentile |ONNX - sklearn| difference per graph on the held-out sample."""
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        print("onnxruntime not installed; skipping drift check")
+        return
+    from data.data_loader import load_frame
+
+    sample_df = load_frame(DRIFT_SAMPLE_FILE)
+    _, held_out = train_test_split(sample_df, test_size=0.2, random_state=42)
+
+    for file_name, model, pipeline in (
+        (FLOOD_ONNX_FILE, predictor.flood_model, predictor.flood_pipeline),
+        (DISEASE_ONNX_FILE, predictor.disease_model, predictor.disease_pipeline),
+    ):
+        X = held_out[pipeline.feature_columns].to_numpy()
+        session = ort.InferenceSession(exported[file_name], providers=["CPUExecutionProvider"])
+        onnx_out = session.run(None, {ONNX_INPUT_NAME: X.astype(np.float32)})[0]
+        sklearn_out = model.predict(pipeline.scaler.transform(X))
+        drift = np.abs(onnx_out.reshape(sklearn_out.shape) - sklearn_out)
+        print(f"  {file_name}: float32 drift max {drift.max():.2e}, "
+              f"p99.9 {np.percentile(drift, 99.9):.2e} over {len(X)} held-out rows")
+
+
+def export_and_save(models_dir: Path = None):
+    from models.combined_predictor import CombinedPredictor
+
+    if models_dir is None:
+        models_dir = Path(__file__).parent / "saved"
+
+    print("Loading trained models...")
+    predictor = CombinedPredictor.from_saved_models(models_dir)
+
+    flood = build_flood_pipeline(predictor.flood_model, predictor.flood_pipeline)
+    disease = build_disease_pipeline(predictor.disease_model, predictor.disease_pipeline)
+
+    # Convert both before writing either, and never leave one graph from an older
+    # export next to a fresh one
+    try:
+        exported = {}
+        for pipeline, columns, file_name in (
+            (flood, predictor.flood_pipeline.feature_columns, FLOOD_ONNX_FILE),
+            (disease, predictor.disease_pipeline.feature_columns, DISEASE_ONNX_FILE),
+        ):
+            onnx_model = _to_onnx(pipeline, len(columns))
+            entry = onnx_model.metadata_props.add()
+            entry.key = SOURCE_HASH_KEY
+            entry.value = source_hash(models_dir, file_name)
+            exported[file_name] = onnx_model.SerializeToString()
+        
+        for file_name, data in exported.items():
+            with open(models_dir / file_name, 'wb') as f:
+                f.write(data)
+            print(f"✓ ONNX model saved to: {models_dir / file_name}")
+    except Exception:
+        for file_name in ONNX_SOURCES:
+            (models_dir / file_name).unlink(missing_ok=True)
+        print("✗ ONNX export failed; removed existing .onnx files so sklearn serves predictions")
+        raise
+
+    report_drift(exported, predictor)
+
+
+if __name__ == "__main__":
+    export_and_save()